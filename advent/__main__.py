@@ -0,0 +1,365 @@
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from advent import batch, bench, generate, history, imports, parallel, parity, profiling
+from advent.answers import AnswerStore
+from advent.cache import ParseCache
+from advent.days import DEFAULT_INPUT_PATTERN, day_name, select_days
+from advent.puzzle import puzzle_of
+
+
+def _add_day_args(parser: argparse.ArgumentParser, *, single_input: bool = True):
+    parser.add_argument("days", nargs="*", help="days to run, like `day01` or `1` (default: all)")
+    if single_input:
+        parser.add_argument(
+            "--input", dest="input_pattern", default=DEFAULT_INPUT_PATTERN,
+            help=f"input file path; `{{day}}` is replaced by the day name (default: {DEFAULT_INPUT_PATTERN})",
+        )
+    parser.add_argument(
+        "--cache", action="store_true",
+        help="reuse parsed inputs saved by earlier runs, keyed by input hash and parser version",
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="for days that support it, parse and solve every part in one pass over the input, in constant memory",
+    )
+
+
+def _add_store_args(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--store", action="store_true",
+        help="reuse answers saved by earlier runs, keyed by input hash and solver version, and save new ones",
+    )
+    parser.add_argument(
+        "--verify", action="store_true",
+        help="recompute every answer and fail on any that differs from the saved one (implies --store)",
+    )
+
+
+def cmd_bench(args: argparse.Namespace) -> int:
+    if args.profile:
+        return cmd_profile(args)
+    specs = select_days(args.days)
+    results = bench.bench(
+        specs,
+        input_pattern=args.input_pattern,
+        repeat=args.repeat,
+        warmup=args.warmup,
+        memory=not args.no_memory,
+        parse_cache=ParseCache() if args.cache else None,
+        stream=args.stream,
+        workers=args.workers,
+    )
+    print(bench.format_table(results))
+    if counters := bench.format_counters(results):
+        print()
+        print(counters)
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(bench.to_json(results, repeat=args.repeat, warmup=args.warmup))
+    if not args.no_history:
+        history.record_results(results, Path(args.history), rss=history.peak_rss())
+    return 0 if all(result.error is None for result in results) else 1
+
+
+def cmd_compare(args: argparse.Namespace) -> int:
+    records = history.load_history(Path(args.history))
+    try:
+        baseline = history.select_revision(records, args.baseline)
+        candidate = history.select_revision(records, args.candidate)
+    except ValueError as e:  # an ambiguous revision, or HEAD outside of git
+        print(e, file=sys.stderr)
+        return 2
+    for revision, selected in ((args.baseline, baseline), (args.candidate, candidate)):
+        if len(selected) == 0:
+            print(f"no benchmark history for {revision!r} in {args.history}", file=sys.stderr)
+            return 2
+    comparisons = history.compare(baseline, candidate)
+    print(history.format_comparisons(comparisons, threshold=args.threshold, n_sigmas=args.sigmas))
+    n_regressions = sum(
+        comparison.is_regression(threshold=args.threshold, n_sigmas=args.sigmas)
+        for comparison in comparisons
+    )
+    if n_regressions > 0:
+        print(f"{n_regressions} phases regressed")
+        return 1
+    return 0
+
+
+def cmd_profile(args: argparse.Namespace) -> int:
+    if args.collapsed and not profiling.can_sample_stacks():
+        print("--collapsed needs signal.setitimer, which this platform doesn't have", file=sys.stderr)
+        return 2
+    day_profiles = []
+    for spec in select_days(args.days):
+        day_profile = profiling.profile_day(
+            spec,
+            input_pattern=args.input_pattern,
+            output_dir=Path(args.profile_dir),
+            top=args.top,
+            collapsed=args.collapsed,
+            parse_cache=ParseCache() if args.cache else None,
+            stream=args.stream,
+        )
+        print(profiling.format_profile(day_profile, top=args.top))
+        day_profiles.append(day_profile)
+    results = [day_profile.result for day_profile in day_profiles]
+    print("(timings include profiling overhead)")
+    print(bench.format_table(results))
+    return 0 if all(result.error is None for result in results) else 1
+
+
+def cmd_run(args: argparse.Namespace) -> int:
+    specs = select_days(args.days)
+    n_workers = args.jobs or parallel.default_n_workers()
+    results, wall = parallel.run_parallel(
+        specs,
+        input_pattern=args.input_pattern,
+        jobs=n_workers,
+        timings_path=Path(args.timings),
+        use_cache=args.cache,
+        stream=args.stream,
+        use_store=args.store or args.verify,
+        verify=args.verify,
+    )
+    day_results = [job.to_day_result() for job in sorted(results, key=lambda j: j.day)]
+    print(bench.format_table(day_results))
+    if counters := bench.format_counters(day_results):
+        print()
+        print(counters)
+    print()
+    print(parallel.format_schedule(results, wall, n_workers))
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(bench.to_json(day_results, jobs=n_workers, wall=wall))
+    return 0 if all(job.error is None for job in results) else 1
+
+
+def cmd_batch(args: argparse.Namespace) -> int:
+    directory = Path(args.directory)
+    parse_cache = ParseCache() if args.cache else None
+    answer_store = AnswerStore() if args.store or args.verify else None
+    results = []
+    for spec in select_days(args.days):
+        paths = batch.find_inputs(directory, spec.name, args.pattern)
+        if len(paths) == 0:
+            continue  # no inputs for this day
+        results.append(batch.solve_many(
+            spec,
+            paths,
+            parse_cache=parse_cache,
+            stream=args.stream,
+            answer_store=answer_store,
+            verify=args.verify,
+        ))
+    print(batch.format_batches(results))
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(batch.to_json(results, directory=str(directory), pattern=args.pattern))
+    return 0 if all(result.error is None and result.n_errors == 0 for result in results) else 1
+
+
+def cmd_parity(args: argparse.Namespace) -> int:
+    days = [day_name(name) for name in args.days] or parity.days_with_several_languages()
+    languages = args.languages.split(",") if args.languages else None
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for day in days:
+            input_path = Path(args.input_pattern.format(day=day))
+            if args.lines is not None:
+                scaled_path = Path(tmp_dir) / f"{day}.txt"
+                parity.scale_input(input_path, args.lines, scaled_path)
+                input_path = scaled_path
+            results.extend(parity.run_parity(day, input_path, languages=languages, repeat=args.repeat))
+    print(parity.format_parity(results))
+    by_day = {}
+    for result in results:
+        by_day.setdefault(result.day, []).append(result)
+    return 0 if all(parity.answers_agree(day_results) for day_results in by_day.values()) else 1
+
+
+def cmd_clear_cache(args: argparse.Namespace) -> int:
+    parse_cache = ParseCache()
+    days = [day_name(name) for name in args.days] or [None]
+    n_removed = sum(parse_cache.clear(day) for day in days)
+    print(f"removed {n_removed} cached inputs from {parse_cache.directory}")
+    return 0
+
+
+def cmd_clear_answers(args: argparse.Namespace) -> int:
+    answer_store = AnswerStore()
+    days = [day_name(name) for name in args.days] or [None]
+    n_removed = sum(answer_store.invalidate(day) for day in days)
+    print(f"removed {n_removed} stored answers from {answer_store.path}")
+    return 0
+
+
+def cmd_imports(args: argparse.Namespace) -> int:
+    # not limited to discovered days, so that e.g. `day20_pytorch` can be checked too
+    module_names = [day_name(name) for name in args.modules] or [spec.name for spec in select_days(None)]
+    reports = [imports.report_imports(name) for name in module_names]
+    print(imports.format_reports(reports, top=args.top))
+    loadable = [report.module for report in reports if report.error is None]
+    suite_us = imports.time_suite(loadable) if len(loadable) > 0 else 0
+    print(f"cold start for {len(loadable)} modules together: {suite_us / 1000:.1f} ms")
+    if args.budget is not None and suite_us / 1e6 > args.budget:
+        print(f"over budget of {1000 * args.budget:.1f} ms")
+        return 1
+    return 0 if len(loadable) == len(reports) else 1
+
+
+def cmd_generate(args: argparse.Namespace) -> int:
+    cols = args.rows if args.cols is None else args.cols
+    for day in map(day_name, args.days):
+        path = Path(args.output.format(day=day, rows=args.rows, cols=cols))
+        if day not in generate.GENERATORS:
+            # days built on `advent.puzzle` can bring their own generator; `--rows` is its size
+            spec, = select_days([day])
+            puzzle = puzzle_of(spec.import_module())
+            if puzzle is None or puzzle.generate is None:
+                raise ValueError(f"no generator for {day!r}")
+            n_lines = generate.write_lines(puzzle.generate(args.rows, np.random.default_rng(args.seed)), path)
+            print(f"{day}: {n_lines} lines -> {path}")
+            continue
+        grid = generate.generate(day, args.rows, cols, seed=args.seed)
+        generate.write_grid(grid, path)
+        print(f"{day}: {grid.shape[0]}x{grid.shape[1]} -> {path}")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m advent")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_bench = subparsers.add_parser("bench", help="time each phase of each day")
+    _add_day_args(parser_bench)
+    parser_bench.add_argument("-n", "--repeat", type=int, default=3, help="timed runs per day")
+    parser_bench.add_argument("-w", "--warmup", type=int, default=1, help="untimed runs per day before timing")
+    parser_bench.add_argument("--no-memory", action="store_true", help="skip the extra run that traces peak memory")
+    parser_bench.add_argument(
+        "--workers", type=int, nargs="+",
+        help="for days with an `N_WORKERS` setting, the processes to split their work between; "
+        "give several counts to see how they scale",
+    )
+    parser_bench.add_argument("--json", help="also write results as JSON to this path")
+    parser_bench.add_argument(
+        "--history", default=str(history.DEFAULT_HISTORY_PATH),
+        help="file that every run's timings get appended to, along with the git commit",
+    )
+    parser_bench.add_argument("--no-history", action="store_true", help="don't append this run to the history")
+    parser_bench.add_argument(
+        "--profile", action="store_true",
+        help="instead of timing, run each day once under cProfile and tracemalloc, and save the profiles",
+    )
+    parser_bench.add_argument("--profile-dir", default=str(profiling.DEFAULT_PROFILE_DIR), help="where --profile writes to")
+    parser_bench.add_argument("--top", type=int, default=10, help="functions and allocation sites to list per phase")
+    parser_bench.add_argument(
+        "--collapsed", action="store_true",
+        help="with --profile, also sample call stacks into flamegraph-ready `.collapsed` files",
+    )
+    parser_bench.set_defaults(func=cmd_bench)
+
+    parser_compare = subparsers.add_parser(
+        "compare", help="compare benchmark history between two commits; fails if any phase got slower",
+    )
+    parser_compare.add_argument(
+        "baseline", help="commit (or unique prefix) to compare against; add -dirty for runs with local changes",
+    )
+    parser_compare.add_argument(
+        "candidate", nargs="?", default="HEAD",
+        help="commit to check (default: HEAD, including any uncommitted changes)",
+    )
+    parser_compare.add_argument(
+        "--threshold", type=float, default=0.1,
+        help="fraction by which the median may grow before it counts as a regression (default: 0.1)",
+    )
+    parser_compare.add_argument(
+        "--sigmas", type=float, default=3.0,
+        help="the slowdown must also exceed this many standard errors, estimated from the MADs of the runs (default: 3)",
+    )
+    parser_compare.add_argument("--history", default=str(history.DEFAULT_HISTORY_PATH))
+    parser_compare.set_defaults(func=cmd_compare)
+
+    parser_run = subparsers.add_parser("run", help="run every day once, in parallel worker processes")
+    _add_day_args(parser_run)
+    parser_run.add_argument("-j", "--jobs", type=int, help="worker processes (default: CPU count)")
+    parser_run.add_argument(
+        "--timings", default=str(parallel.DEFAULT_TIMINGS_PATH),
+        help="durations from previous runs, used to start the longest days first",
+    )
+    parser_run.add_argument("--json", help="also write results as JSON to this path")
+    _add_store_args(parser_run)
+    parser_run.set_defaults(func=cmd_run)
+
+    parser_batch = subparsers.add_parser(
+        "batch", help="solve many input files per day in one process each, and report throughput",
+    )
+    parser_batch.add_argument("directory", help="directory to look for input files in")
+    _add_day_args(parser_batch, single_input=False)
+    parser_batch.add_argument(
+        "--pattern", default=batch.DEFAULT_BATCH_PATTERN,
+        help=f"glob for a day's inputs inside the directory, with `{{day}}` filled in, "
+        f"e.g. `*/{{day}}.txt` for one subdirectory per account (default: {batch.DEFAULT_BATCH_PATTERN})",
+    )
+    parser_batch.add_argument("--json", help="also write the answers for every input as JSON to this path")
+    _add_store_args(parser_batch)
+    parser_batch.set_defaults(func=cmd_batch)
+
+    parser_parity = subparsers.add_parser(
+        "parity", help="run each language's version of a day on the same input; compare answers and speed",
+    )
+    parser_parity.add_argument(
+        "days", nargs="*", help="days to compare (default: every day written in more than one language)",
+    )
+    parser_parity.add_argument(
+        "--input", dest="input_pattern", default=DEFAULT_INPUT_PATTERN,
+        help=f"input file path; `{{day}}` is replaced by the day name (default: {DEFAULT_INPUT_PATTERN})",
+    )
+    parser_parity.add_argument(
+        "--lines", type=int,
+        help="first scale the input up (or down) to this many lines by repeating it, renumbering Game/Card ids",
+    )
+    parser_parity.add_argument(
+        "--languages", help=f"comma-separated subset of {','.join(parity.LANGUAGES)} (default: all)",
+    )
+    parser_parity.add_argument("-n", "--repeat", type=int, default=3, help="runs per language; medians are reported")
+    parser_parity.set_defaults(func=cmd_parity)
+
+    parser_clear_cache = subparsers.add_parser("clear-cache", help="delete parsed inputs saved by --cache")
+    parser_clear_cache.add_argument("days", nargs="*", help="days to clear (default: all)")
+    parser_clear_cache.set_defaults(func=cmd_clear_cache)
+
+    parser_clear_answers = subparsers.add_parser("clear-answers", help="delete answers saved by --store")
+    parser_clear_answers.add_argument("days", nargs="*", help="days to clear (default: all)")
+    parser_clear_answers.set_defaults(func=cmd_clear_answers)
+
+    parser_imports = subparsers.add_parser("imports", help="import time of each day module, from a cold start")
+    parser_imports.add_argument("modules", nargs="*", help="modules to import, like `day24` or `24` (default: all days)")
+    parser_imports.add_argument("--top", type=int, default=3, help="heaviest packages to list per module")
+    parser_imports.add_argument("--budget", type=float, help="fail if importing everything takes longer (seconds)")
+    parser_imports.set_defaults(func=cmd_imports)
+
+    parser_generate = subparsers.add_parser("generate", help="write synthetic large inputs")
+    parser_generate.add_argument(
+        "days", nargs="+",
+        help=f"days to generate, from {sorted(generate.GENERATORS)} or any day with a `puzzle.generator`",
+    )
+    parser_generate.add_argument("--rows", type=int, default=1000)
+    parser_generate.add_argument("--cols", type=int, help="(default: same as --rows)")
+    parser_generate.add_argument("--seed", type=int, default=generate.DEFAULT_SEED)
+    parser_generate.add_argument(
+        "-o", "--output", default=generate.DEFAULT_OUTPUT_PATTERN,
+        help=f"output path; `{{day}}`, `{{rows}}` and `{{cols}}` are filled in (default: {generate.DEFAULT_OUTPUT_PATTERN})",
+    )
+    parser_generate.set_defaults(func=cmd_generate)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
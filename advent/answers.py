@@ -0,0 +1,101 @@
+import functools
+import hashlib
+import inspect
+import json
+import sqlite3
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any, NamedTuple
+
+from advent.cache import file_sha256, source_sha256
+from advent.days import STATE_DIR, DaySpec
+
+DEFAULT_ANSWERS_PATH = STATE_DIR / "answers.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    day TEXT NOT NULL,
+    part TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    solver_version TEXT NOT NULL,
+    answer TEXT NOT NULL,  -- JSON
+    seconds REAL NOT NULL,  -- how long it took to compute
+    computed_at REAL NOT NULL,  -- unix time
+    PRIMARY KEY (day, part, input_hash, solver_version)
+) WITHOUT ROWID
+"""
+
+
+class AnswerKey(NamedTuple):
+    day: str
+    input_hash: str
+    solver_version: str
+
+
+@functools.cache  # only hash the source once per process
+def solver_version(spec: DaySpec, module: ModuleType) -> str:
+    # a day can pin this explicitly; otherwise any edit to the day's module, to the `advent` helpers it uses,
+    # or to how the runner calls it, gives its answers a new version
+    explicit = getattr(module, "SOLVER_VERSION", None)
+    if explicit is not None:
+        return str(explicit)
+    sha = hashlib.sha256(source_sha256(module).encode("ascii"))
+    sha.update(inspect.getsource(spec.solve).encode("utf-8"))
+    return sha.hexdigest()
+
+
+class AnswerStore:
+    """
+    Answers already computed for each part, kept in SQLite and keyed by day, part, input hash and solver version.
+    Lookups go straight to the primary key, so they take microseconds
+    """
+
+    def __init__(self, path: Path = DEFAULT_ANSWERS_PATH):
+        self.path = path
+        self._connection: sqlite3.Connection | None = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # parallel runs write from several processes at once
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(_SCHEMA)
+        return self._connection
+
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def key(self, spec: DaySpec, module: ModuleType, input_path: Path) -> AnswerKey:
+        return AnswerKey(day=spec.name, input_hash=file_sha256(input_path), solver_version=solver_version(spec, module))
+
+    def get(self, key: AnswerKey, part: str) -> tuple[bool, Any]:
+        row = self.connection.execute(
+            "SELECT answer FROM answers WHERE day = ? AND part = ? AND input_hash = ? AND solver_version = ?",
+            (key.day, part, key.input_hash, key.solver_version),
+        ).fetchone()
+        if row is None:
+            return False, None
+        return True, json.loads(row[0])
+
+    def put(self, key: AnswerKey, part: str, answer: Any, seconds: float):
+        # `answer` must already be JSON-friendly; see `advent.bench.jsonable`
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key.day, part, key.input_hash, key.solver_version, json.dumps(answer), seconds, time.time()),
+            )
+
+    def invalidate(self, day: str | None = None) -> int:
+        if not self.path.exists():
+            return 0
+        with self.connection:
+            if day is None:
+                cursor = self.connection.execute("DELETE FROM answers")
+            else:
+                cursor = self.connection.execute("DELETE FROM answers WHERE day = ?", (day,))
+        return cursor.rowcount
@@ -0,0 +1,140 @@
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from advent.bench import READ_INPUT, STREAM, jsonable, run_once
+from advent.days import DaySpec
+
+if TYPE_CHECKING:
+    from advent.answers import AnswerStore
+    from advent.cache import ParseCache
+
+DEFAULT_BATCH_PATTERN = "{day}/*.txt"
+
+
+@dataclass
+class InputAnswers:
+    input_path: str
+    answers: list[Any] = field(default_factory=list)
+    seconds: float = 0.0  # reading the input plus solving every part
+    error: str | None = None
+
+
+@dataclass
+class BatchResult:
+    day: str
+    import_seconds: float = 0.0
+    inputs: list[InputAnswers] = field(default_factory=list)
+    error: str | None = None  # the module itself couldn't be imported
+
+    @property
+    def seconds(self) -> float:
+        return self.import_seconds + sum(input_.seconds for input_ in self.inputs)
+
+    @property
+    def n_errors(self) -> int:
+        return sum(input_.error is not None for input_ in self.inputs)
+
+    @property
+    def throughput(self) -> float:
+        # inputs per second, over the whole batch including the one-off import
+        return len(self.inputs) / self.seconds if self.seconds > 0 else 0.0
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "day": self.day,
+            "import_seconds": self.import_seconds,
+            "seconds": self.seconds,
+            "throughput": self.throughput,
+            "error": self.error,
+            "inputs": [
+                {
+                    "input_path": input_.input_path,
+                    "answers": input_.answers,
+                    "seconds": input_.seconds,
+                    "error": input_.error,
+                }
+                for input_ in self.inputs
+            ],
+        }
+
+
+def find_inputs(directory: Path, day: str, pattern: str = DEFAULT_BATCH_PATTERN) -> list[Path]:
+    return sorted(path for path in directory.glob(pattern.format(day=day)) if path.is_file())
+
+
+def solve_many(
+        spec: DaySpec,
+        paths: list[Path],
+        *,
+        parse_cache: "ParseCache | None" = None,
+        stream: bool = False,
+        answer_store: "AnswerStore | None" = None,
+        verify: bool = False,
+) -> BatchResult:
+    """
+    Answers for each of many input files of one day, all in this process.
+    The module is imported once, so its module-level tables and memos stay warm from one input to the next
+    """
+    result = BatchResult(day=spec.name)
+    import_start = time.perf_counter()
+    try:
+        module = spec.import_module()
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+        return result
+    result.import_seconds = time.perf_counter() - import_start
+    for path in paths:
+        input_answers = InputAnswers(input_path=str(path))
+        start = time.perf_counter()
+        try:
+            measurements = run_once(
+                spec,
+                module,
+                path,
+                parse_cache=parse_cache,
+                stream=stream,
+                answer_store=answer_store,
+                verify=verify,
+            )
+        except Exception as e:
+            input_answers.error = f"{type(e).__name__}: {e}"
+        else:
+            for measurement in measurements:
+                if measurement.phase == STREAM:
+                    input_answers.answers.extend(map(jsonable, measurement.answer))
+                elif measurement.phase != READ_INPUT:
+                    input_answers.answers.append(jsonable(measurement.answer))
+        input_answers.seconds = time.perf_counter() - start
+        result.inputs.append(input_answers)
+    return result
+
+
+def format_batches(results: list[BatchResult]) -> str:
+    header = ("day", "inputs", "errors", "import ms", "first ms", "rest mean ms", "inputs/s")
+    rows = []
+    for result in results:
+        if result.error is not None:
+            rows.append((result.day, "ERROR", "", "", "", "", result.error))
+            continue
+        seconds = [input_.seconds for input_ in result.inputs]
+        rows.append((
+            result.day,
+            str(len(seconds)),
+            str(result.n_errors),
+            f"{1000 * result.import_seconds:.2f}",
+            f"{1000 * seconds[0]:.2f}" if len(seconds) > 0 else "-",
+            f"{1000 * sum(seconds[1:]) / (len(seconds) - 1):.2f}" if len(seconds) > 1 else "-",
+            f"{result.throughput:.1f}",
+        ))
+    widths = [max(len(row[i]) for row in (header, *rows)) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) if i == 0 else cell.rjust(width) for i, (cell, width) in enumerate(zip(row, widths)))
+        for row in (header, *rows)
+    )
+
+
+def to_json(results: list[BatchResult], **meta) -> str:
+    return json.dumps({**meta, "days": [result.to_json() for result in results]}, indent=2)
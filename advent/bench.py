@@ -0,0 +1,396 @@
+import contextlib
+import io
+import json
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Callable, Iterable, TypeVar
+
+from advent import instrument
+from advent.days import DEFAULT_INPUT_PATTERN, DaySpec, read_input
+from advent.stream import solve_stream, supports_streaming
+
+if TYPE_CHECKING:
+    from advent.answers import AnswerKey, AnswerStore
+    from advent.cache import ParseCache
+
+T = TypeVar("T")
+
+READ_INPUT = "read_input"
+STREAM = "stream"  # parsing and every part at once, for days that support it
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
+
+
+@dataclass
+class Measurement:
+    phase: str
+    wall: float  # seconds
+    cpu: float  # seconds
+    peak_memory: int | None  # bytes allocated on top of what was live when the phase started
+    answer: Any
+    cache: str | None = None  # `CACHE_HIT` or `CACHE_MISS` if the parse cache (or, for parts, the answer store) was used
+    counters: dict[str, int] = field(default_factory=dict)  # from `advent.instrument`, e.g. heap operations
+
+
+def measure(phase: str, func: Callable[[], T], *, trace_memory: bool = False) -> tuple[Measurement, T]:
+    if trace_memory:
+        tracemalloc.reset_peak()
+        memory_start, _ = tracemalloc.get_traced_memory()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    with instrument.collect() as counters:
+        result = func()
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+    if trace_memory:
+        _, memory_peak = tracemalloc.get_traced_memory()
+        peak_memory = memory_peak - memory_start
+    else:
+        peak_memory = None
+    measurement = Measurement(
+        phase=phase,
+        wall=wall,
+        cpu=cpu,
+        peak_memory=peak_memory,
+        answer=result,
+        counters=dict(counters),
+    )
+    return measurement, result
+
+
+def _run_once(
+        spec: DaySpec,
+        module: ModuleType,
+        input_path: Path,
+        *,
+        trace_memory: bool = False,
+        parse_cache: "ParseCache | None" = None,
+        measure_phase: Callable[..., tuple[Measurement, Any]] = measure,
+        stream: bool = False,
+) -> list[Measurement]:
+    # `measure_phase` has the signature of `measure`; profiling swaps in its own
+    measurements = []
+    # solvers are free to print; keep that out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        if stream and supports_streaming(module):
+            # there's no parsed input to cache, and the parts can't be timed separately
+            measurement, _ = measure_phase(STREAM, lambda: solve_stream(module, input_path), trace_memory=trace_memory)
+            return [measurement]
+        if parse_cache is None or not parse_cache.accepts(module):
+            measurement, input_ = measure_phase(
+                READ_INPUT,
+                lambda: read_input(module, input_path),
+                trace_memory=trace_memory,
+            )
+        else:
+            measurement, (input_, hit) = measure_phase(
+                READ_INPUT,
+                lambda: parse_cache.read_input(spec.name, module, input_path),
+                trace_memory=trace_memory,
+            )
+            measurement.cache = CACHE_HIT if hit else CACHE_MISS
+        measurement.answer = None  # parsed input is not an answer
+        measurements.append(measurement)
+        parts = spec.solve(module, input_)
+        for part_name in spec.parts_of(module):
+            measurement, _ = measure_phase(part_name, lambda: next(parts), trace_memory=trace_memory)
+            measurements.append(measurement)
+    return measurements
+
+
+def _lookup_answers(
+        answer_store: "AnswerStore",
+        key: "AnswerKey",
+        part_names: tuple[str, ...],
+        measure_phase: Callable[..., tuple[Measurement, Any]],
+) -> list[Measurement] | None:
+    measurements = []
+    for part_name in part_names:
+        measurement, (hit, answer) = measure_phase(part_name, lambda: answer_store.get(key, part_name))
+        if not hit:
+            return None
+        measurement.answer = answer
+        measurement.cache = CACHE_HIT
+        measurements.append(measurement)
+    return measurements
+
+
+def _store_answers(
+        answer_store: "AnswerStore",
+        key: "AnswerKey",
+        part_names: tuple[str, ...],
+        measurements: list[Measurement],
+        *,
+        verify: bool,
+):
+    if len(measurements) == 1 and measurements[0].phase == STREAM:
+        stream_measurement, = measurements
+        answers = [
+            (part_name, answer, stream_measurement.wall)
+            for part_name, answer in zip(part_names, stream_measurement.answer)
+        ]
+    else:
+        answers = [
+            (measurement.phase, measurement.answer, measurement.wall)
+            for measurement in measurements
+            if measurement.phase in part_names
+        ]
+        for measurement in measurements:
+            if measurement.phase in part_names:
+                measurement.cache = CACHE_MISS
+    mismatches = []
+    for part_name, answer, seconds in answers:
+        answer = jsonable(answer)
+        if verify:
+            hit, stored = answer_store.get(key, part_name)
+            if hit:
+                if stored != answer:
+                    mismatches.append(f"{part_name} stored {stored!r} but computed {answer!r}")
+                continue
+        answer_store.put(key, part_name, answer, seconds)
+    if len(mismatches) > 0:
+        raise ValueError(f"answer store is out of date: {'; '.join(mismatches)}")
+
+
+def run_once(
+        spec: DaySpec,
+        module: ModuleType,
+        input_path: Path,
+        *,
+        trace_memory: bool = False,
+        parse_cache: "ParseCache | None" = None,
+        measure_phase: Callable[..., tuple[Measurement, Any]] = measure,
+        stream: bool = False,
+        answer_store: "AnswerStore | None" = None,
+        verify: bool = False,
+) -> list[Measurement]:
+    """
+    Read the input and solve every part, measuring each phase.
+    With an `answer_store`, answers already in it are returned without solving anything,
+    unless `verify` is set, in which case everything is recomputed and checked against the store
+    """
+    kwargs = dict(trace_memory=trace_memory, parse_cache=parse_cache, measure_phase=measure_phase, stream=stream)
+    if answer_store is None:
+        return _run_once(spec, module, input_path, **kwargs)
+    key = answer_store.key(spec, module, input_path)
+    if not verify:
+        measurements = _lookup_answers(answer_store, key, spec.parts_of(module), measure_phase)
+        if measurements is not None:
+            return measurements
+    measurements = _run_once(spec, module, input_path, **kwargs)
+    _store_answers(answer_store, key, spec.parts_of(module), measurements, verify=verify)
+    return measurements
+
+
+@dataclass
+class PhaseResult:
+    phase: str
+    wall: list[float] = field(default_factory=list)
+    cpu: list[float] = field(default_factory=list)
+    peak_memory: int | None = None
+    answer: Any = None
+    cache_hits: int = 0
+    cache_misses: int = 0
+    counters: dict[str, int] = field(default_factory=dict)  # from the last run; they don't vary between runs
+
+    def add(self, measurement: Measurement):
+        self.wall.append(measurement.wall)
+        self.cpu.append(measurement.cpu)
+        self.answer = measurement.answer
+        self.counters = measurement.counters
+        if measurement.cache == CACHE_HIT:
+            self.cache_hits += 1
+        elif measurement.cache == CACHE_MISS:
+            self.cache_misses += 1
+
+    def to_json(self) -> dict[str, Any]:
+        data = {
+            "phase": self.phase,
+            "wall": _summarize(self.wall),
+            "cpu": _summarize(self.cpu),
+            "peak_memory": self.peak_memory,
+            "answer": jsonable(self.answer),
+        }
+        if self.cache_hits + self.cache_misses > 0:
+            data["cache"] = {"hits": self.cache_hits, "misses": self.cache_misses}
+        if len(self.counters) > 0:
+            data["counters"] = self.counters
+        return data
+
+
+@dataclass
+class DayResult:
+    day: str
+    input_path: str
+    phases: list[PhaseResult] = field(default_factory=list)
+    error: str | None = None
+    workers: int | None = None  # for days that split their work across processes; see `set_workers`
+
+    @property
+    def label(self) -> str:
+        return self.day if self.workers is None else f"{self.day} (workers={self.workers})"
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "day": self.day,
+            "input_path": self.input_path,
+            "workers": self.workers,
+            "phases": [phase.to_json() for phase in self.phases],
+            "error": self.error,
+        }
+
+
+def set_workers(module: ModuleType, workers: int) -> bool:
+    # days that can split their work across processes say how many with a module-level `N_WORKERS`
+    if not hasattr(module, "N_WORKERS"):
+        return False
+    module.N_WORKERS = workers
+    return True
+
+
+def _summarize(samples: list[float]) -> dict[str, Any]:
+    if len(samples) == 0:
+        return {"n": 0}
+    return {
+        "n": len(samples),
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "max": max(samples),
+    }
+
+
+def jsonable(answer: Any) -> Any:
+    if hasattr(answer, "item"):  # numpy scalar
+        answer = answer.item()
+    if answer is None or isinstance(answer, (bool, int, float, str)):
+        return answer
+    if isinstance(answer, (list, tuple)):
+        return [jsonable(a) for a in answer]
+    return repr(answer)
+
+
+def bench_day(
+        spec: DaySpec,
+        *,
+        input_pattern: str = DEFAULT_INPUT_PATTERN,
+        repeat: int = 1,
+        warmup: int = 0,
+        memory: bool = True,
+        parse_cache: "ParseCache | None" = None,
+        stream: bool = False,
+        workers: int | None = None,
+) -> DayResult:
+    if repeat < 1:
+        raise ValueError(f"{repeat=} must be a positive integer")
+    input_path = spec.input_path(input_pattern)
+    result = DayResult(day=spec.name, input_path=str(input_path))
+    try:
+        module = spec.import_module()
+        if workers is not None and set_workers(module, workers):
+            result.workers = workers
+        for _ in range(warmup):
+            run_once(spec, module, input_path, parse_cache=parse_cache, stream=stream)
+        phases: dict[str, PhaseResult] = {}
+        for _ in range(repeat):
+            for measurement in run_once(spec, module, input_path, parse_cache=parse_cache, stream=stream):
+                phases.setdefault(measurement.phase, PhaseResult(phase=measurement.phase)).add(measurement)
+        if memory:
+            # separate pass, since tracing allocations distorts the timings
+            tracemalloc.start()
+            try:
+                for measurement in run_once(
+                        spec,
+                        module,
+                        input_path,
+                        trace_memory=True,
+                        parse_cache=parse_cache,
+                        stream=stream,
+                ):
+                    phases[measurement.phase].peak_memory = measurement.peak_memory
+            finally:
+                tracemalloc.stop()
+        result.phases = list(phases.values())
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    return result
+
+
+def bench(specs: Iterable[DaySpec], *, workers: list[int] | None = None, **kwargs) -> list[DayResult]:
+    # with several worker counts, days that can use them get benchmarked once per count, to show how they scale
+    results = []
+    for spec in specs:
+        for n_workers in workers or [None]:
+            result = bench_day(spec, workers=n_workers, **kwargs)
+            results.append(result)
+            if result.workers is None:
+                break  # the day can't use workers (or failed), so once is enough
+    return results
+
+
+def _format_seconds(samples: list[float]) -> str:
+    return f"{1000 * statistics.median(samples):.2f}" if len(samples) > 0 else "-"
+
+
+def _format_bytes(n: int | None) -> str:
+    return f"{n / 1024:.1f}" if n is not None else "-"
+
+
+def _format_answer(phase: PhaseResult) -> str:
+    answer = "" if phase.answer is None else str(jsonable(phase.answer))
+    if phase.cache_hits + phase.cache_misses > 0:
+        cache = f"cache: {phase.cache_hits} hit, {phase.cache_misses} miss"
+        answer = f"{answer} ({cache})" if answer != "" else cache
+    return answer
+
+
+def format_table(results: list[DayResult]) -> str:
+    header = ("day", "phase", "wall ms", "min ms", "cpu ms", "peak KiB", "answer")
+    rows = []
+    for result in results:
+        if result.error is not None:
+            rows.append((result.label, "ERROR", "", "", "", "", result.error))
+            continue
+        for phase in result.phases:
+            rows.append((
+                result.label,
+                phase.phase,
+                _format_seconds(phase.wall),
+                f"{1000 * min(phase.wall):.2f}",
+                _format_seconds(phase.cpu),
+                _format_bytes(phase.peak_memory),
+                _format_answer(phase),
+            ))
+    widths = [
+        max(len(row[i]) for row in (header, *rows))
+        for i in range(len(header) - 1)  # don't pad the last column
+    ]
+    lines = []
+    for row in (header, *rows):
+        cells = [cell.ljust(width) if i < 2 else cell.rjust(width) for i, (cell, width) in enumerate(zip(row, widths))]
+        lines.append("  ".join(cells + [row[-1]]))
+    return "\n".join(lines)
+
+
+def format_counters(results: list[DayResult]) -> str:
+    # operation counts, and how many of them happened per second of (median) wall time
+    lines = []
+    for result in results:
+        for phase in result.phases:
+            if len(phase.counters) == 0:
+                continue
+            wall = statistics.median(phase.wall)
+            counts = ", ".join(
+                f"{name} {value}" + (f" ({value / wall:,.0f}/s)" if wall > 0 else "")
+                for name, value in sorted(phase.counters.items())
+            )
+            lines.append(f"{result.label} {phase.phase}: {counts}")
+    return "\n".join(lines)
+
+
+def to_json(results: list[DayResult], **meta) -> str:
+    return json.dumps({**meta, "days": [result.to_json() for result in results]}, indent=2)
@@ -0,0 +1,140 @@
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import numpy as np
+
+from advent.days import STATE_DIR, read_input
+
+DEFAULT_CACHE_DIR = STATE_DIR / "parsed"
+CACHE_FORMAT_VERSION = 1  # bump when the on-disk layout changes
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_sha256(path: Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _advent_dependencies(module: ModuleType) -> list[ModuleType]:
+    # the `advent` modules that a day uses anything from, and the ones those use in turn
+    found: dict[str, ModuleType] = {}
+    to_visit = [module]
+    while len(to_visit) > 0:
+        for value in vars(to_visit.pop()).values():
+            name = value.__name__ if isinstance(value, ModuleType) else getattr(value, "__module__", None)
+            if isinstance(name, str) and name.startswith("advent.") and name not in found:
+                found[name] = sys.modules[name]
+                to_visit.append(found[name])
+    return [found[name] for name in sorted(found)]
+
+
+@functools.cache  # only hash the source once per process
+def source_sha256(module: ModuleType) -> str:
+    """
+    SHA-256 of a day's module and of every `advent` helper it uses, since days hand most of their work to helpers
+    """
+    sha = hashlib.sha256()
+    for source_module in (module, *_advent_dependencies(module)):
+        sha.update(Path(inspect.getfile(source_module)).read_bytes())
+    return sha.hexdigest()
+
+
+def parser_version(module: ModuleType) -> str:
+    # a day can pin this explicitly; otherwise any edit to the day's module, or to the helpers it uses,
+    # invalidates its cache entries
+    explicit = getattr(module, "PARSER_VERSION", None)
+    if explicit is not None:
+        return str(explicit)
+    return source_sha256(module)
+
+
+def _is_plain_array(obj: Any) -> bool:
+    return isinstance(obj, np.ndarray) and obj.dtype != object
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class ParseCache:
+    """
+    Parsed `Input`s stored on disk, keyed by the SHA-256 of the input file and the version of the parser.
+    Plain numpy arrays go in `.npz` files, anything else in a pickle tagged with `CACHE_FORMAT_VERSION`
+    """
+
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR):
+        self.directory = directory
+
+    @staticmethod
+    def accepts(module: ModuleType) -> bool:
+        # a day whose parsed input is no cheaper to load than its file, like a memory map of it, opts out
+        return getattr(module, "CACHE_PARSED_INPUT", True)
+
+    def key(self, day: str, module: ModuleType, input_path: Path) -> str:
+        input_hash = file_sha256(input_path)
+        version_hash = hashlib.sha256(f"{CACHE_FORMAT_VERSION}:{parser_version(module)}".encode("utf-8")).hexdigest()
+        return f"{day}-{input_hash[:24]}-{version_hash[:12]}"
+
+    def _load(self, key: str) -> tuple[bool, Any]:
+        npz_path = self.directory / f"{key}.npz"
+        pickle_path = self.directory / f"{key}.pickle"
+        try:
+            if npz_path.exists():
+                with np.load(npz_path, allow_pickle=False) as data:
+                    return True, data["input"]
+            if pickle_path.exists():
+                with open(pickle_path, "rb") as f:
+                    format_version, input_ = pickle.load(f)
+                if format_version == CACHE_FORMAT_VERSION:
+                    return True, input_
+        except Exception:  # unreadable entry; treat it like a miss, and it'll get overwritten
+            pass
+        return False, None
+
+    def _store(self, key: str, input_: Any):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if _is_plain_array(input_):
+            path = self.directory / f"{key}.npz"
+            tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+            np.savez(tmp_path, input=input_)
+            os.replace(tmp_path, path)
+        else:
+            data = pickle.dumps((CACHE_FORMAT_VERSION, input_), protocol=pickle.HIGHEST_PROTOCOL)
+            _write_atomic(self.directory / f"{key}.pickle", data)
+
+    def read_input(self, day: str, module: ModuleType, input_path: Path) -> tuple[Any, bool]:
+        """
+        Same as `advent.days.read_input`, but goes through the cache.
+        Also returns whether it was a cache hit
+        """
+        key = self.key(day, module, input_path)
+        hit, input_ = self._load(key)
+        if hit:
+            return input_, True
+        input_ = read_input(module, input_path)
+        self._store(key, input_)  # before any solver gets a chance to modify it
+        return input_, False
+
+    def clear(self, day: str | None = None) -> int:
+        if not self.directory.exists():
+            return 0
+        pattern = "*" if day is None else f"{day}-*"
+        n_removed = 0
+        for path in self.directory.glob(pattern):
+            path.unlink()
+            n_removed += 1
+        return n_removed
@@ -0,0 +1,187 @@
+import contextlib
+import importlib
+import io
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Iterator
+
+from advent.puzzle import puzzle_of
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DAY_MODULE_GLOB = "day[0-9][0-9].py"
+
+DEFAULT_INPUT_PATTERN = "inputs/{day}.txt"
+STATE_DIR = Path(".advent")  # timings, caches, etc. kept between runs
+
+# takes a day module and its parsed input, and yields the answer of each part in order;
+# the runner times the gap between consecutive yields as one phase
+Solve = Callable[[ModuleType, Any], Iterator[Any]]
+
+
+def _solve1_solve2(module: ModuleType, input_: Any) -> Iterator[Any]:
+    if (puzzle := puzzle_of(module)) is not None:
+        yield from puzzle.solve(input_)
+        return
+    yield module.solve1(input_)
+    yield module.solve2(input_)
+
+
+@dataclass(frozen=True)
+class DaySpec:
+    name: str
+    solve: Solve = _solve1_solve2
+    part_names: tuple[str, ...] = ("part1", "part2")
+
+    def import_module(self) -> ModuleType:
+        if str(REPO_ROOT) not in sys.path:
+            sys.path.insert(0, str(REPO_ROOT))
+        return importlib.import_module(self.name)
+
+    def input_path(self, pattern: str = DEFAULT_INPUT_PATTERN) -> Path:
+        return Path(pattern.format(day=self.name))
+
+    def parts_of(self, module: ModuleType) -> tuple[str, ...]:
+        # days built on `advent.puzzle` declare their own parts
+        if (puzzle := puzzle_of(module)) is not None:
+            return tuple(puzzle.parts)
+        return self.part_names
+
+
+def parser_of(module: ModuleType) -> Callable[[], Any]:
+    puzzle = puzzle_of(module)
+    if puzzle is not None and puzzle.read_input is not None:
+        return puzzle.read_input
+    return module.read_input
+
+
+def read_input(module: ModuleType, input_path: Path) -> Any:
+    # every day reads from its module-level `INPUT_FILE_PATH` at call time, so overriding it is enough
+    module.INPUT_FILE_PATH = input_path
+    return parser_of(module)()
+
+
+def _captured_lines(func: Callable[[], Any]) -> list[str]:
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        func()
+    return out.getvalue().splitlines()
+
+
+def _day03(module: ModuleType, input_: Any) -> Iterator[Any]:
+    solver = module.Solver(input_)
+    yield solver.solve1()
+    yield solver.solve2()
+
+
+def _day07(module: ModuleType, input_: Any) -> Iterator[Any]:
+    yield module.solve(input_, j_is_joker=False)
+    yield module.solve(input_, j_is_joker=True)
+
+
+def _day10(module: ModuleType, input_: Any) -> Iterator[Any]:
+    grid, start_loc = input_
+    answer, loop_locs = module.solve1(grid, start_loc)
+    yield answer
+    yield module.solve2(grid, loop_locs)
+
+
+def _day11(module: ModuleType, input_: Any) -> Iterator[Any]:
+    yield module.solve(input_, expansion=2)
+    yield module.solve(input_, expansion=1_000_000)
+
+
+def _day12(module: ModuleType, input_: Any) -> Iterator[Any]:
+    yield module.solve(input_)
+    yield module.solve(input_, expand=5)
+
+
+def _day13(module: ModuleType, input_: Any) -> Iterator[Any]:
+    yield module.solve(input_)
+    yield module.solve(input_, smudges=1)
+
+
+def _day14(module: ModuleType, input_: Any) -> Iterator[Any]:
+    yield module.solve1(input_)
+    yield module.solve2(input_, n_cycles=1_000_000_000)
+
+
+def _day17(module: ModuleType, input_: Any) -> Iterator[Any]:
+    solver = module.Solver(input_)
+    yield solver.solve()
+    yield solver.solve(ultra=True)
+
+
+def _day19(module: ModuleType, input_: Any) -> Iterator[Any]:
+    yield module.solve1(input_)
+    yield module.solve2(input_[0])
+
+
+def _day20(module: ModuleType, input_: Any) -> Iterator[Any]:
+    # prints both answers rather than returning them
+    yield _captured_lines(lambda: module.solve(input_))
+
+
+def _day21(module: ModuleType, input_: Any) -> Iterator[Any]:
+    yield module.solve1(input_, n_steps=64)
+    yield module.solve2(input_, n_steps=1000)
+
+
+def _day22(module: ModuleType, input_: Any) -> Iterator[Any]:
+    yield from module.solve(input_)  # already yields one answer per part
+
+
+def _day23(module: ModuleType, input_: Any) -> Iterator[Any]:
+    yield module.Solver(input_).solve()
+    yield module.Solver(input_, ignore_ice=True).solve()
+
+
+def _day24(module: ModuleType, input_: Any) -> Iterator[Any]:
+    yield module.solve2(input_)  # part 1 is disabled in `day24.main`
+
+
+def _solve_only(module: ModuleType, input_: Any) -> Iterator[Any]:
+    yield module.solve(input_)
+
+
+# days whose `main` doesn't follow the plain `solve1(input_)` / `solve2(input_)` pattern
+_SPECIAL_CASES: dict[str, dict[str, Any]] = {
+    "day03": dict(solve=_day03),
+    "day07": dict(solve=_day07),
+    "day10": dict(solve=_day10),
+    "day11": dict(solve=_day11),
+    "day12": dict(solve=_day12),
+    "day13": dict(solve=_day13),
+    "day14": dict(solve=_day14),
+    "day17": dict(solve=_day17),
+    "day19": dict(solve=_day19),
+    "day20": dict(solve=_day20, part_names=("solve",)),
+    "day21": dict(solve=_day21),
+    "day22": dict(solve=_day22),
+    "day23": dict(solve=_day23),
+    "day24": dict(solve=_day24, part_names=("part2",)),
+    "day25": dict(solve=_solve_only, part_names=("solve",)),
+}
+
+
+def discover_days() -> dict[str, DaySpec]:
+    return {
+        path.stem: DaySpec(name=path.stem, **_SPECIAL_CASES.get(path.stem, {}))
+        for path in sorted(REPO_ROOT.glob(DAY_MODULE_GLOB))
+    }
+
+
+def day_name(name: str) -> str:
+    return f"day{int(name):02d}" if name.isdigit() else name
+
+
+def select_days(names: list[str] | None) -> list[DaySpec]:
+    all_days = discover_days()
+    if not names:
+        return list(all_days.values())
+    selected = []
+    for name in map(day_name, names):
+        if name not in all_days:
+            raise ValueError(f"unknown day {name!r}; expected one of {sorted(all_days)}")
+        selected.append(all_days[name])
+    return selected
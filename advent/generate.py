@@ -0,0 +1,256 @@
+from pathlib import Path
+from typing import Callable, Iterable
+
+import numpy as np
+
+DEFAULT_OUTPUT_PATTERN = "inputs/generated/{day}_{rows}x{cols}.txt"
+DEFAULT_SEED = 2023
+
+Grid = np.ndarray  # 2D array of uint8 ascii codes
+Generator = Callable[[int, int, np.random.Generator], Grid]
+
+_WRITE_CHUNK_ROWS = 4096
+
+
+def _sym(s: str) -> int:
+    return ord(s)
+
+
+def _choose(rng: np.random.Generator, shape: tuple[int, int], weights: dict[str, int]) -> Grid:
+    """
+    Draw a grid of symbols, where `weights` are out of 256.
+    Goes through a 256-entry lookup table so even 10k x 10k grids never leave uint8
+    """
+    if sum(weights.values()) != 256:
+        raise ValueError(f"weights must add up to 256, but got {sum(weights.values())}")
+    table = np.concatenate([
+        np.full(weight, _sym(s), dtype=np.uint8)
+        for s, weight in weights.items()
+    ])
+    return table[rng.integers(0, 256, size=shape, dtype=np.uint8)]
+
+
+def gen_day03(rows: int, cols: int, rng: np.random.Generator) -> Grid:
+    grid = _choose(rng, (rows, cols), {".": 166, "0": 80, "*": 10})
+    is_digit = grid == _sym("0")
+    # cap numbers at 3 digits, like the real schematics
+    run_length = np.zeros(rows, dtype=np.uint8)
+    for c in range(cols):
+        run_length = np.where(is_digit[:, c], run_length + 1, 0).astype(np.uint8)
+        too_long = run_length > 3
+        is_digit[too_long, c] = False
+        run_length[too_long] = 0
+    grid[grid == _sym("0")] = _sym(".")
+    grid[is_digit] = rng.integers(_sym("0"), _sym("9") + 1, size=np.count_nonzero(is_digit), dtype=np.uint8)
+    is_symbol = grid == _sym("*")
+    symbols = np.frombuffer(b"*****#+$/@=%&-", dtype=np.uint8)  # about a third are gears
+    grid[is_symbol] = rng.choice(symbols, size=np.count_nonzero(is_symbol))
+    # the Kotlin solver, which `parity` runs on these, doesn't bounds-check around gears, so keep gears off the border
+    is_border = np.ones((rows, cols), dtype=bool)
+    is_border[1:-1, 1:-1] = False
+    grid[is_border & (grid == _sym("*"))] = _sym("#")
+    return grid
+
+
+_PIPE_DIRECTIONS = {  # (row shift, col shift) of each side a pipe connects to
+    "|": {(-1, 0), (1, 0)},
+    "-": {(0, -1), (0, 1)},
+    "L": {(-1, 0), (0, 1)},
+    "J": {(-1, 0), (0, -1)},
+    "7": {(0, -1), (1, 0)},
+    "F": {(0, 1), (1, 0)},
+}
+
+
+def _draw_pipe_column_links(grid: Grid, c_start: int, left: np.ndarray, right: np.ndarray):
+    """
+    Draw one piece of loop in each column starting at `c_start`,
+    entering from the left at row `left[i]` and leaving to the right at row `right[i]`
+    """
+    cols = c_start + np.arange(len(left))
+    low, high = np.minimum(left, right), np.maximum(left, right)
+    r = np.arange(grid.shape[0])[:, np.newaxis]
+    section = grid[:, c_start:(c_start + len(left))]
+    section[(low < r) & (r < high)] = _sym("|")
+    flat = left == right
+    grid[left[flat], cols[flat]] = _sym("-")
+    down = left < right
+    grid[left[down], cols[down]] = _sym("7")
+    grid[right[down], cols[down]] = _sym("L")
+    up = left > right
+    grid[left[up], cols[up]] = _sym("J")
+    grid[right[up], cols[up]] = _sym("F")
+
+
+def gen_day10(rows: int, cols: int, rng: np.random.Generator) -> Grid:
+    if rows < 2 or cols < 2:
+        raise ValueError("need at least a 2x2 grid to fit a loop")
+    grid = _choose(rng, (rows, cols), {".": 136, "|": 20, "-": 20, "L": 20, "J": 20, "7": 20, "F": 20})
+    # single closed loop: an upper path running left-to-right through the top half of the grid,
+    # and a lower path running back through the bottom half; the two halves never touch.
+    # `upper[c]` / `lower[c]` is the row where each path crosses from column `c - 1` into column `c`
+    mid = rows // 2
+    upper = rng.integers(0, mid, size=cols)
+    lower = rng.integers(mid, rows, size=cols)
+    # left end: column 0 joins the two paths
+    grid[upper[1]:lower[1], 0] = _sym("|")
+    grid[upper[1], 0] = _sym("F")
+    grid[lower[1], 0] = _sym("L")
+    # right end: the last column joins them again
+    grid[upper[-1]:lower[-1], -1] = _sym("|")
+    grid[upper[-1], -1] = _sym("7")
+    grid[lower[-1], -1] = _sym("J")
+    if cols > 2:
+        _draw_pipe_column_links(grid, 1, upper[1:-1], upper[2:])
+        _draw_pipe_column_links(grid, 1, lower[1:-1], lower[2:])
+    # put the start somewhere on the upper path
+    c_start = rng.integers(0, cols)
+    r_start = upper[max(c_start, 1)]
+    start_pipe = chr(grid[r_start, c_start])
+    # make sure no stray pipe next to the start looks like it's part of the loop
+    for r_shift, c_shift in {(-1, 0), (1, 0), (0, -1), (0, 1)} - _PIPE_DIRECTIONS[start_pipe]:
+        r, c = r_start + r_shift, c_start + c_shift
+        if not (0 <= r < rows and 0 <= c < cols):
+            continue
+        neighbor = chr(grid[r, c])
+        if (-r_shift, -c_shift) in _PIPE_DIRECTIONS.get(neighbor, set()):
+            grid[r, c] = _sym(".")
+    grid[r_start, c_start] = _sym("S")
+    return grid
+
+
+def gen_day11(rows: int, cols: int, rng: np.random.Generator) -> Grid:
+    grid = _choose(rng, (rows, cols), {".": 253, "#": 3})
+    # leave some rows and columns empty so that there's space to expand
+    grid[rng.random(rows) < 0.1, :] = _sym(".")
+    grid[:, rng.random(cols) < 0.1] = _sym(".")
+    return grid
+
+
+def gen_day13(rows: int, cols: int, rng: np.random.Generator) -> Grid:
+    """
+    A single pattern of the requested size.
+    It has a perfect vertical mirror (part 1), and a horizontal mirror with exactly one smudge (part 2).
+    Random content makes any other reflection vanishingly unlikely, but only for grids bigger than puzzle size
+    """
+    if rows < 2 or cols < 3:
+        raise ValueError("need at least a 2x3 grid to fit both mirrors")
+    grid = rng.integers(0, 2, size=(rows, cols), dtype=np.uint8).astype(bool)
+    # vertical mirror close to the right edge, so plenty of columns are not reflected
+    n_reflected_cols = int(rng.integers(1, max(2, cols // 4)))
+    c_mirror = cols - n_reflected_cols
+    grid[:, c_mirror:] = grid[:, (c_mirror - n_reflected_cols):c_mirror][:, ::-1]
+    # horizontal mirror somewhere in the middle; copying whole rows keeps the vertical mirror intact
+    r_mirror = int(rng.integers(max(1, rows // 4), max(2, (3 * rows) // 4)))
+    n_reflected_rows = min(r_mirror, rows - r_mirror)
+    grid[r_mirror:(r_mirror + n_reflected_rows)] = grid[(r_mirror - n_reflected_rows):r_mirror][::-1]
+    # smudge: outside the vertical mirror, inside the horizontal one
+    r_smudge = int(rng.integers(r_mirror - n_reflected_rows, r_mirror))
+    c_smudge = int(rng.integers(0, c_mirror - n_reflected_cols))
+    grid[r_smudge, c_smudge] = not grid[r_smudge, c_smudge]
+    return np.where(grid, _sym("#"), _sym(".")).astype(np.uint8)
+
+
+def gen_day14(rows: int, cols: int, rng: np.random.Generator) -> Grid:
+    return _choose(rng, (rows, cols), {".": 146, "#": 40, "O": 70})
+
+
+def gen_day16(rows: int, cols: int, rng: np.random.Generator) -> Grid:
+    return _choose(rng, (rows, cols), {".": 216, "\\": 10, "/": 10, "|": 10, "-": 10})
+
+
+def gen_day17(rows: int, cols: int, rng: np.random.Generator) -> Grid:
+    return rng.integers(_sym("1"), _sym("9") + 1, size=(rows, cols), dtype=np.uint8)
+
+
+def gen_day21(rows: int, cols: int, rng: np.random.Generator) -> Grid:
+    grid = _choose(rng, (rows, cols), {".": 216, "#": 40})
+    # like the real garden: start in the middle, with its row and column clear
+    r_start, c_start = rows // 2, cols // 2
+    grid[r_start, :] = _sym(".")
+    grid[:, c_start] = _sym(".")
+    grid[r_start, c_start] = _sym("S")
+    return grid
+
+
+def gen_day23(rows: int, cols: int, rng: np.random.Generator, *, extra_passage_rate: float = 0.0) -> Grid:
+    """
+    Maze of single-width trails, built on the odd (row, col) cells.
+    Even sizes are rounded down to the next odd one, so the output may be 1 smaller than requested.
+    Starts as a binary-tree maze, in which every cell can be reached from the start by only moving right/down,
+    so the '>' and 'v' slopes put on every passage never make the end unreachable.
+    `extra_passage_rate` opens additional walls to create loops (and make the longest path harder)
+    """
+    rows -= 1 - rows % 2
+    cols -= 1 - cols % 2
+    if rows < 3 or cols < 3:
+        raise ValueError("need at least a 3x3 grid to fit a trail")
+    n_rows, n_cols = rows // 2, cols // 2  # size of the lattice of odd cells
+    grid = np.full((rows, cols), _sym("#"), dtype=np.uint8)
+    grid[1::2, 1::2] = _sym(".")
+    # binary-tree maze: each lattice cell opens a passage either up or left
+    go_up = rng.random((n_rows, n_cols)) < 0.5
+    go_up[0, :] = False
+    go_up[:, 0] = True
+    go_up[0, 0] = False
+    go_left = ~go_up
+    go_left[0, 0] = False
+    if extra_passage_rate > 0:
+        go_up |= rng.random((n_rows, n_cols)) < extra_passage_rate
+        go_left |= rng.random((n_rows, n_cols)) < extra_passage_rate
+        go_up[0, :] = False
+        go_left[:, 0] = False
+    # passages above a lattice cell are walked downward, passages to its left are walked rightward
+    passages_up = grid[0:-1:2, 1::2]
+    passages_up[go_up] = _sym("v")
+    passages_left = grid[1::2, 0:-1:2]
+    passages_left[go_left] = _sym(">")
+    # openings in the outer wall
+    grid[0, 1] = _sym(".")
+    grid[-1, -2] = _sym(".")
+    return grid
+
+
+GENERATORS: dict[str, Generator] = {
+    "day03": gen_day03,
+    "day10": gen_day10,
+    "day11": gen_day11,
+    "day13": gen_day13,
+    "day14": gen_day14,
+    "day16": gen_day16,
+    "day17": gen_day17,
+    "day21": gen_day21,
+    "day23": gen_day23,
+}
+
+
+def generate(day: str, rows: int, cols: int | None = None, *, seed: int = DEFAULT_SEED) -> Grid:
+    try:
+        generator = GENERATORS[day]
+    except KeyError:
+        raise ValueError(f"no generator for {day!r}; expected one of {sorted(GENERATORS)}") from None
+    if cols is None:
+        cols = rows
+    return generator(rows, cols, np.random.default_rng(seed))
+
+
+def write_lines(lines: Iterable[str], path: Path) -> int:
+    # for days that generate their own inputs; see `advent.puzzle.Puzzle.generator`
+    path.parent.mkdir(parents=True, exist_ok=True)
+    n_lines = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(f"{line}\n")
+            n_lines += 1
+    return n_lines
+
+
+def write_grid(grid: Grid, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        for r_start in range(0, grid.shape[0], _WRITE_CHUNK_ROWS):
+            chunk = grid[r_start:(r_start + _WRITE_CHUNK_ROWS)]
+            lines = np.empty((chunk.shape[0], chunk.shape[1] + 1), dtype=np.uint8)
+            lines[:, :-1] = chunk
+            lines[:, -1] = _sym("\n")
+            f.write(lines.tobytes())
@@ -0,0 +1,81 @@
+import mmap
+from pathlib import Path
+
+import numpy as np
+
+from advent.text import NEWLINE
+
+ByteGrid = np.ndarray  # 2D array of uint8 ascii codes
+
+CARRIAGE_RETURN = ord("\r")
+
+
+def load_byte_grid(path: Path) -> ByteGrid:
+    """
+    Memory-map a text file of equal-length lines and view it as a 2D uint8 array of ascii codes, without copying.
+    The row stride skips over the line endings, so the result is read-only and not contiguous;
+    `.copy()` it before writing to it
+    """
+    with open(path, "rb") as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files can't be mapped
+            return np.zeros((0, 0), dtype=np.uint8)
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    # ignore blank lines at the end
+    end = len(data)
+    while end > 0 and data[end - 1] in (NEWLINE, CARRIAGE_RETURN):
+        end -= 1
+    first_newline = buffer.find(b"\n", 0, end)
+    if first_newline == -1:  # just one line
+        return data[:end].reshape(1, end)
+    width = first_newline
+    if width > 0 and data[width - 1] == CARRIAGE_RETURN:
+        width -= 1
+    stride = first_newline + 1
+    n_rows, remainder = divmod(end + stride - width, stride)
+    if remainder != 0 or np.any(data[first_newline:end:stride] != NEWLINE):
+        raise ValueError(f"lines in {path} are not all the same length")
+    return np.lib.stride_tricks.as_strided(data, shape=(n_rows, width), strides=(stride, 1), writeable=False)
+
+
+# directions as small ints, in clockwise order, so turning is just adding one (mod 4)
+UP, RIGHT, DOWN, LEFT = range(4)
+DIRECTIONS = (UP, RIGHT, DOWN, LEFT)
+DIRECTION_DELTAS = ((-1, 0), (0, 1), (1, 0), (0, -1))  # (row, col) step of each direction
+OPPOSITE = (DOWN, LEFT, UP, RIGHT)
+TURN_LEFT = (LEFT, UP, RIGHT, DOWN)
+TURN_RIGHT = (RIGHT, DOWN, LEFT, UP)
+
+
+class FlatGrid:
+    """
+    A 2D grid wrapped in a one-cell border of `pad` and flattened, so each cell is a single int index
+    and stepping in a direction is just adding `steps[direction]` to it.
+    Every neighbor of an inner cell is in range, so hot loops can check for `pad` instead of doing bounds checks
+    """
+
+    def __init__(self, grid: np.ndarray, pad: int):
+        if len(grid.shape) != 2:
+            raise ValueError("only ready to handle 2D grids")
+        self.shape: tuple[int, int] = grid.shape
+        self.width = grid.shape[1] + 2
+        padded = np.full((grid.shape[0] + 2, self.width), pad, dtype=np.int64)
+        padded[1:-1, 1:-1] = grid
+        # a list rather than an array, since indexing single cells from python is much faster that way
+        self.cells: list[int] = padded.ravel().tolist()
+        self.pad = pad
+        self.steps = tuple(d_row * self.width + d_col for d_row, d_col in DIRECTION_DELTAS)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def index(self, loc: tuple[int, int]) -> int:
+        return (loc[0] + 1) * self.width + loc[1] + 1
+
+    def loc(self, index: int) -> tuple[int, int]:
+        row, col = divmod(index, self.width)
+        return row - 1, col - 1
+
+    def shift(self, index: int, direction: int) -> int:
+        return index + self.steps[direction]
@@ -0,0 +1,211 @@
+import json
+import math
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from advent.bench import DayResult
+from advent.cache import file_sha256
+from advent.days import REPO_ROOT, STATE_DIR
+
+try:
+    import resource
+except ImportError:  # not on windows
+    resource = None
+
+DEFAULT_HISTORY_PATH = STATE_DIR / "history.jsonl"
+DIRTY_SUFFIX = "-dirty"
+MAD_TO_STDDEV = 1.4826  # scales the median absolute deviation to match a standard deviation, for normal noise
+MEDIAN_STDERR_FACTOR = 1.2533  # the standard error of a median is this times that of a mean, for normal noise
+
+
+@dataclass
+class HistoryRecord:
+    timestamp: float
+    commit: str | None
+    dirty: bool
+    day: str
+    phase: str
+    input_path: str
+    input_size: int  # bytes
+    input_hash: str
+    wall: list[float]  # seconds, one per timed run
+    cpu: list[float]
+    peak_memory: int | None  # bytes, traced by `tracemalloc`
+    peak_rss: int | None  # bytes; the high-water mark of the whole benchmark process so far
+    workers: int | None = None  # for days that split their work across processes
+
+    @property
+    def revision(self) -> str:
+        return f"{self.commit}{DIRTY_SUFFIX}" if self.dirty else str(self.commit)
+
+
+def _git(*args: str) -> str | None:
+    try:
+        proc = subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True)
+    except FileNotFoundError:
+        return None
+    return proc.stdout.strip() if proc.returncode == 0 else None
+
+
+def current_revision() -> tuple[str | None, bool]:
+    commit = _git("rev-parse", "HEAD")
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return commit, bool(status)
+
+
+def peak_rss() -> int | None:
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else 1024 * max_rss  # linux reports KiB
+
+
+def record_results(results: list[DayResult], path: Path = DEFAULT_HISTORY_PATH, *, rss: int | None = None) -> int:
+    commit, dirty = current_revision()
+    timestamp = time.time()
+    records = []
+    for result in results:
+        if result.error is not None:
+            continue
+        input_path = Path(result.input_path)
+        input_size = input_path.stat().st_size
+        input_hash = file_sha256(input_path)
+        for phase in result.phases:
+            records.append(HistoryRecord(
+                timestamp=timestamp,
+                commit=commit,
+                dirty=dirty,
+                day=result.day,
+                phase=phase.phase,
+                input_path=result.input_path,
+                input_size=input_size,
+                input_hash=input_hash,
+                wall=phase.wall,
+                cpu=phase.cpu,
+                peak_memory=phase.peak_memory,
+                peak_rss=rss,
+                workers=result.workers,
+            ))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(asdict(record)) + "\n")
+    return len(records)
+
+
+def load_history(path: Path = DEFAULT_HISTORY_PATH) -> list[HistoryRecord]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return [HistoryRecord(**json.loads(line)) for line in f if line.strip() != ""]
+    except FileNotFoundError:
+        return []
+
+
+def select_revision(records: list[HistoryRecord], revision: str) -> list[HistoryRecord]:
+    """
+    Records of one revision: a commit hash (or unique prefix of one), or "HEAD" for the current state of the tree.
+    A "-dirty" suffix selects runs made with uncommitted changes on top of that commit
+    """
+    if revision == "HEAD":
+        commit, dirty = current_revision()
+        if commit is None:
+            raise ValueError("can't find the current commit; is git installed, and is this a git repo?")
+    else:
+        dirty = revision.endswith(DIRTY_SUFFIX)
+        commit = revision.removesuffix(DIRTY_SUFFIX)
+    selected = [
+        record
+        for record in records
+        if record.commit is not None and record.commit.startswith(commit) and record.dirty == dirty
+    ]
+    revisions = {record.revision for record in selected}
+    if len(revisions) > 1:
+        raise ValueError(f"{revision!r} is ambiguous; it matches {sorted(revisions)}")
+    return selected
+
+
+def median_mad(samples: list[float]) -> tuple[float, float]:
+    median = statistics.median(samples)
+    return median, statistics.median(abs(sample - median) for sample in samples)
+
+
+def median_stderr(samples: list[float]) -> float:
+    # robust to the odd outlier run, and shrinks as more runs get pooled
+    _, mad = median_mad(samples)
+    return MEDIAN_STDERR_FACTOR * MAD_TO_STDDEV * mad / math.sqrt(len(samples))
+
+
+@dataclass
+class Comparison:
+    day: str
+    phase: str
+    input_path: str
+    workers: int | None = None
+    baseline: list[float] = field(default_factory=list)
+    candidate: list[float] = field(default_factory=list)
+
+    @property
+    def label(self) -> str:
+        return self.day if self.workers is None else f"{self.day} (workers={self.workers})"
+
+    def stats(self) -> tuple[float, float, float, float]:
+        return (*median_mad(self.baseline), *median_mad(self.candidate))
+
+    @property
+    def ratio(self) -> float:
+        base_median, _, candidate_median, _ = self.stats()
+        return candidate_median / base_median if base_median > 0 else float("inf")
+
+    def is_regression(self, *, threshold: float, n_sigmas: float) -> bool:
+        # slower by more than the threshold, and by more than the noise in the difference of the medians
+        base_median, _, candidate_median, _ = self.stats()
+        noise = n_sigmas * math.hypot(median_stderr(self.baseline), median_stderr(self.candidate))
+        delta = candidate_median - base_median
+        return delta > threshold * base_median and delta > noise
+
+
+def compare(baseline: list[HistoryRecord], candidate: list[HistoryRecord]) -> list[Comparison]:
+    # runs are only comparable on the same input and number of workers, so match on those;
+    # repeated bench runs get pooled
+    comparisons: dict[tuple[str, str, str, int], Comparison] = {}
+    for records, attr in ((baseline, "baseline"), (candidate, "candidate")):
+        for record in records:
+            key = (record.day, record.phase, record.input_hash, record.workers or 0)
+            comparison = comparisons.setdefault(
+                key,
+                Comparison(record.day, record.phase, record.input_path, record.workers),
+            )
+            getattr(comparison, attr).extend(record.wall)
+    return [
+        comparison
+        for _, comparison in sorted(comparisons.items())
+        if len(comparison.baseline) > 0 and len(comparison.candidate) > 0
+    ]
+
+
+def format_comparisons(comparisons: list[Comparison], *, threshold: float, n_sigmas: float) -> str:
+    header = ("day", "phase", "base ms", "±MAD", "new ms", "±MAD", "ratio", "runs", "")
+    rows = []
+    for comparison in comparisons:
+        base_median, base_mad, candidate_median, candidate_mad = comparison.stats()
+        rows.append((
+            comparison.label,
+            comparison.phase,
+            f"{1000 * base_median:.2f}",
+            f"{1000 * base_mad:.2f}",
+            f"{1000 * candidate_median:.2f}",
+            f"{1000 * candidate_mad:.2f}",
+            f"{comparison.ratio:.2f}x",
+            f"{len(comparison.baseline)}/{len(comparison.candidate)}",
+            "REGRESSION" if comparison.is_regression(threshold=threshold, n_sigmas=n_sigmas) else "",
+        ))
+    widths = [max(len(row[i]) for row in (header, *rows)) for i in range(len(header) - 1)]
+    lines = []
+    for row in (header, *rows):
+        cells = [cell.ljust(width) if i < 2 else cell.rjust(width) for i, (cell, width) in enumerate(zip(row, widths))]
+        lines.append("  ".join(cells + [row[-1]]).rstrip())
+    return "\n".join(lines)
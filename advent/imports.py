@@ -0,0 +1,105 @@
+import re
+import subprocess
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+
+from advent.days import REPO_ROOT
+
+RE_IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+@dataclass
+class ImportTiming:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int  # 0 for imports done directly by the code being timed
+
+
+def parse_importtime(stderr: str) -> list[ImportTiming]:
+    timings = []
+    for line in stderr.splitlines():
+        match = RE_IMPORT_TIME.match(line)
+        if match is None:
+            continue  # header, or something else printed to stderr
+        self_us, cumulative_us, indent, name = match.groups()
+        timings.append(ImportTiming(
+            name=name,
+            self_us=int(self_us),
+            cumulative_us=int(cumulative_us),
+            depth=(len(indent) - 1) // 2,
+        ))
+    return timings
+
+
+def time_imports(module_names: list[str]) -> list[ImportTiming]:
+    # a fresh interpreter each time, so nothing is already imported
+    code = "; ".join(f"import {name}" for name in module_names)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        last_line = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit code {proc.returncode}"
+        raise ImportError(last_line)
+    return parse_importtime(proc.stderr)
+
+
+@dataclass
+class ImportReport:
+    module: str
+    total_us: int = 0
+    by_package: Counter = field(default_factory=Counter)  # self time, summed per top-level package
+    error: str | None = None
+
+
+def report_imports(module_name: str) -> ImportReport:
+    report = ImportReport(module=module_name)
+    try:
+        timings = time_imports([module_name])
+    except ImportError as e:
+        report.error = str(e)
+        return report
+    # python prints a module right after everything it imported, so the module's own line closes its subtree
+    for end, timing in enumerate(timings):
+        if timing.name == module_name and timing.depth == 0:
+            report.total_us = timing.cumulative_us
+            break
+    else:
+        report.error = f"{module_name} not found in -X importtime output"
+        return report
+    # only count what the module pulled in, not what the interpreter imported before running it
+    start = end
+    while start > 0 and timings[start - 1].depth > 0:
+        start -= 1
+    for timing in timings[start:(end + 1)]:
+        report.by_package[timing.name.split(".")[0]] += timing.self_us
+    return report
+
+
+def time_suite(module_names: list[str]) -> int:
+    # cold start of everything in one process; shared dependencies only get paid for once
+    timings = time_imports(module_names)
+    names = set(module_names)
+    return sum(
+        timing.cumulative_us
+        for timing in timings
+        if timing.depth == 0 and timing.name in names
+    )
+
+
+def format_reports(reports: list[ImportReport], *, top: int = 3) -> str:
+    lines = ["module         total ms  heaviest packages (self ms)"]
+    for report in reports:
+        if report.error is not None:
+            lines.append(f"{report.module:<13}  {'ERROR':>8}  {report.error}")
+            continue
+        heaviest = ", ".join(
+            f"{package} {us / 1000:.1f}"
+            for package, us in report.by_package.most_common(top)
+        )
+        lines.append(f"{report.module:<13}  {report.total_us / 1000:8.1f}  {heaviest}")
+    return "\n".join(lines)
@@ -0,0 +1,56 @@
+import contextlib
+import dataclasses
+from collections import Counter
+from typing import Any, Iterator
+
+_tracked: list[tuple[str, Any]] | None = None  # (prefix, stats dataclass) registered while collecting
+_registered: list[tuple[str, Any]] = []  # (prefix, stats dataclass) that live for the whole process
+
+
+def track(prefix: str, stats: Any):
+    """
+    Register a dataclass of integer counters, to be summed into the enclosing `collect()` (if any) when it exits.
+    Costs nothing when nobody is collecting
+    """
+    if _tracked is not None:
+        _tracked.append((prefix, stats))
+
+
+def register(prefix: str, stats: Any):
+    """
+    Register a long-lived dataclass of integer counters, like those of a module-level cache.
+    Each `collect()` counts how much they change while it's open
+    """
+    _registered.append((prefix, stats))
+
+
+def _snapshot() -> list[dict[str, int]]:
+    return [dataclasses.asdict(stats) for _, stats in _registered]
+
+
+@contextlib.contextmanager
+def collect() -> Iterator[Counter]:
+    """
+    Gather the counters of everything tracked inside the block, named like "heap.pushes".
+    The returned `Counter` is filled in when the block exits
+    """
+    global _tracked
+    outer = _tracked
+    _tracked = []
+    before = _snapshot()
+    counters = Counter()
+    try:
+        yield counters
+    finally:
+        tracked, _tracked = _tracked, outer
+        for prefix, stats in tracked:
+            for name, value in dataclasses.asdict(stats).items():
+                counters[f"{prefix}.{name}"] += value
+        if outer is not None:
+            outer.extend(tracked)
+        # an outer collection sees these changes for itself, so they aren't passed on
+        for i, ((prefix, _), after) in enumerate(zip(_registered, _snapshot())):
+            start = before[i] if i < len(before) else {}
+            for name, value in after.items():
+                if (change := value - start.get(name, 0)) != 0:
+                    counters[f"{prefix}.{name}"] += change
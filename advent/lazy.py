@@ -0,0 +1,37 @@
+import importlib
+import types
+from typing import Any
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stand-in for a module that only gets imported the first time one of its attributes is used.
+    A missing optional dependency therefore only breaks the code paths that actually need it
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._lazy_loaded: types.ModuleType | None = None
+
+    def _load(self) -> types.ModuleType:
+        if self._lazy_loaded is None:
+            self._lazy_loaded = importlib.import_module(self.__name__)
+        return self._lazy_loaded
+
+    def __getattr__(self, attr: str) -> Any:  # only called when normal lookup fails
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> list[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._lazy_loaded is not None else "not loaded yet"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str) -> Any:
+    return LazyModule(name)
+
+
+def is_loaded(module: Any) -> bool:
+    return not isinstance(module, LazyModule) or module._lazy_loaded is not None
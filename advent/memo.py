@@ -0,0 +1,169 @@
+import functools
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable
+
+from advent import instrument
+
+DEFAULT_MAX_SIZE = 1 << 16  # entries
+
+
+@dataclass
+class MemoStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+def _key_size(key: Hashable) -> int:
+    # keys are tuples of the arguments, so what they hold is counted too, down through any nested tuples
+    size = sys.getsizeof(key)
+    if isinstance(key, tuple):
+        size += sum(_key_size(item) for item in key)
+    return size
+
+
+def entry_size(key: Hashable, value: Any) -> int:
+    # the value is measured shallowly, so this is only a rough guide for values that are containers
+    return _key_size(key) + sys.getsizeof(value)
+
+
+class Memo:
+    """
+    A bounded cache of results, which evicts the least recently used ones first.
+    Holds at most `max_size` entries, and (if `max_bytes` is given) at most that many bytes as measured by `sizeof`
+    """
+
+    def __init__(
+            self,
+            stats: MemoStats,
+            *,
+            max_size: int | None = DEFAULT_MAX_SIZE,
+            max_bytes: int | None = None,
+            sizeof: Callable[[Hashable, Any], int] = entry_size,
+    ):
+        self.stats = stats
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.entries: OrderedDict[Hashable, Any] = OrderedDict()  # least recently used first
+        self.sizes: dict[Hashable, int] = {}  # only kept up when there's a `max_bytes`
+        self.n_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.stats.misses += 1
+            return False, None
+        self.entries.move_to_end(key)
+        self.stats.hits += 1
+        return True, value
+
+    def put(self, key: Hashable, value: Any):
+        entries = self.entries
+        if self.max_bytes is not None:
+            size = self.sizeof(key, value)
+            self.n_bytes += size - self.sizes.get(key, 0)
+            self.sizes[key] = size
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > 1 and (
+            (self.max_size is not None and len(entries) > self.max_size)
+            or (self.max_bytes is not None and self.n_bytes > self.max_bytes)
+        ):
+            evicted, _ = entries.popitem(last=False)
+            if self.max_bytes is not None:
+                self.n_bytes -= self.sizes.pop(evicted)
+            self.stats.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.sizes.clear()
+        self.n_bytes = 0
+
+
+_KWARGS_MARK = object()  # sets the keyword arguments apart, so they can't be mistaken for positional ones
+
+
+def _make_key(args: tuple, kwargs: dict[str, Any]) -> Hashable:
+    return (*args, _KWARGS_MARK, *sorted(kwargs.items()))
+
+
+def memoize(
+        func: Callable | None = None,
+        *,
+        max_size: int | None = DEFAULT_MAX_SIZE,
+        max_bytes: int | None = None,
+        sizeof: Callable[[Hashable, Any], int] = entry_size,
+        per_instance: bool = False,
+):
+    """
+    A bounded replacement for `functools.cache`; see `Memo`.
+    With `per_instance=True` the function is a method, and each instance gets a cache of its own, kept on the instance;
+    `self` isn't part of the key, and the cache is freed along with the instance.
+    Hits, misses and evictions are counted by `advent.instrument`, as e.g. "memo.day06._evaluate_race.hits"
+    """
+    if func is None:
+        return functools.partial(
+            memoize,
+            max_size=max_size,
+            max_bytes=max_bytes,
+            sizeof=sizeof,
+            per_instance=per_instance,
+        )
+    stats = MemoStats()
+    instrument.register(f"memo.{func.__module__}.{func.__qualname__}", stats)
+
+    def new_memo() -> Memo:
+        return Memo(stats, max_size=max_size, max_bytes=max_bytes, sizeof=sizeof)
+
+    if per_instance:
+        attr = f"_memo_{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            try:
+                memo = self.__dict__[attr]
+            except KeyError:
+                memo = self.__dict__[attr] = new_memo()
+            key = _make_key(args, kwargs) if kwargs else args
+            try:
+                value = memo.entries[key]
+            except KeyError:
+                stats.misses += 1
+                value = func(self, *args, **kwargs)
+                memo.put(key, value)
+                return value
+            memo.entries.move_to_end(key)
+            stats.hits += 1
+            return value
+
+        wrapper.memo_of = lambda instance: instance.__dict__.get(attr)
+    else:
+        memo = new_memo()
+        entries = memo.entries
+
+        # `Memo.get` inlined, since this is on the hot path of every call
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _make_key(args, kwargs) if kwargs else args
+            try:
+                value = entries[key]
+            except KeyError:
+                stats.misses += 1
+                value = func(*args, **kwargs)
+                memo.put(key, value)
+                return value
+            entries.move_to_end(key)
+            stats.hits += 1
+            return value
+
+        wrapper.memo = memo
+        wrapper.cache_clear = memo.clear
+    wrapper.stats = stats
+    return wrapper
@@ -0,0 +1,158 @@
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from advent.answers import AnswerStore
+from advent.bench import CACHE_HIT, DayResult, Measurement, PhaseResult, jsonable, run_once
+from advent.cache import ParseCache
+from advent.days import DEFAULT_INPUT_PATTERN, STATE_DIR, DaySpec
+
+DEFAULT_TIMINGS_PATH = STATE_DIR / "timings.json"
+
+
+@dataclass
+class Job:
+    day: str
+    input_path: str
+    expected: float  # seconds, from previous runs; `inf` if never seen
+    started: float  # seconds since the pool was started
+    finished: float
+    measurements: list[Measurement] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+    def to_day_result(self) -> DayResult:
+        result = DayResult(day=self.day, input_path=self.input_path, error=self.error)
+        for measurement in self.measurements:
+            phase = PhaseResult(phase=measurement.phase)
+            phase.add(measurement)
+            result.phases.append(phase)
+        return result
+
+
+def _run_job(
+        spec: DaySpec,
+        input_path: Path,
+        expected: float,
+        pool_start: float,
+        use_cache: bool,
+        stream: bool,
+        use_store: bool,
+        verify: bool,
+) -> Job:
+    # runs in a worker process: import + read_input + every part, like `main` would
+    started = time.time() - pool_start
+    answer_store = AnswerStore() if use_store else None
+    try:
+        module = spec.import_module()
+        measurements = run_once(
+            spec,
+            module,
+            input_path,
+            parse_cache=ParseCache() if use_cache else None,
+            stream=stream,
+            answer_store=answer_store,
+            verify=verify,
+        )
+    except Exception as e:
+        measurements = []
+        error = f"{type(e).__name__}: {e}"
+    else:
+        error = None
+        for measurement in measurements:
+            measurement.answer = jsonable(measurement.answer)  # must survive pickling back
+    finally:
+        if answer_store is not None:
+            answer_store.close()
+    return Job(
+        day=spec.name,
+        input_path=str(input_path),
+        expected=expected,
+        started=started,
+        finished=time.time() - pool_start,
+        measurements=measurements,
+        error=error,
+    )
+
+
+def load_expected_durations(path: Path = DEFAULT_TIMINGS_PATH) -> dict[str, float]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_expected_durations(durations: dict[str, float], path: Path = DEFAULT_TIMINGS_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+
+
+def run_parallel(
+        specs: list[DaySpec],
+        *,
+        input_pattern: str = DEFAULT_INPUT_PATTERN,
+        jobs: int | None = None,
+        timings_path: Path = DEFAULT_TIMINGS_PATH,
+        use_cache: bool = False,
+        stream: bool = False,
+        use_store: bool = False,
+        verify: bool = False,
+) -> tuple[list[Job], float]:
+    expected = load_expected_durations(timings_path)
+    # longest job first; days never timed before could be anything, so they go first too
+    ordered = sorted(specs, key=lambda spec: expected.get(spec.name, math.inf), reverse=True)
+    pool_start = time.time()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(
+                _run_job,
+                spec,
+                spec.input_path(input_pattern),
+                expected.get(spec.name, math.inf),
+                pool_start,
+                use_cache,
+                stream,
+                use_store,
+                verify,
+            )
+            for spec in ordered
+        ]
+        results = [future.result() for future in futures]
+    wall = time.time() - pool_start
+    for job in results:
+        # answers straight from the store say nothing about how long solving takes
+        if job.error is None and not all(measurement.cache == CACHE_HIT for measurement in job.measurements):
+            expected[job.day] = job.duration
+    save_expected_durations(expected, timings_path)
+    return results, wall
+
+
+def format_schedule(results: list[Job], wall: float, n_workers: int) -> str:
+    lines = ["day    expected s  start s    end s"]
+    for job in sorted(results, key=lambda j: j.started):
+        expected = "-" if math.isinf(job.expected) else f"{job.expected:.2f}"
+        lines.append(f"{job.day}  {expected:>10}  {job.started:7.2f}  {job.finished:7.2f}")
+    serial = sum(job.duration for job in results)
+    lines.append(f"wall time: {wall:.2f}s on {n_workers} workers (serial sum {serial:.2f}s, speedup {serial / wall:.2f}x)")
+    if len(results) > 0:
+        # jobs are independent, so the slowest single day is the critical path
+        critical = max(results, key=lambda j: j.duration)
+        lower_bound = max(critical.duration, serial / n_workers)
+        lines.append(
+            f"critical path: {critical.day} ({critical.duration:.2f}s, {critical.duration / wall:.0%} of wall time);"
+            f" best possible wall time is {lower_bound:.2f}s"
+        )
+    return "\n".join(lines)
+
+
+def default_n_workers() -> int:
+    return os.cpu_count() or 1
@@ -0,0 +1,191 @@
+import itertools
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from advent.days import REPO_ROOT
+
+# ids that the solvers key their records by, and which must stay unique when lines are repeated
+RE_RECORD_ID = re.compile(r"^(Game|Card)( +)\d+:")
+
+
+@dataclass(frozen=True)
+class Language:
+    name: str
+    directory: Path
+    filename: Callable[[int], str]  # from the day number
+    command: Callable[[Path], list[str]]  # to run a script; each one reads `input.txt` from its working directory
+
+
+LANGUAGES = {
+    language.name: language
+    for language in (
+        Language(
+            name="python",
+            directory=REPO_ROOT,
+            filename=lambda day_num: f"day{day_num:02d}.py",
+            command=lambda path: [sys.executable, str(path)],
+        ),
+        Language(
+            name="typescript",
+            directory=REPO_ROOT / "javascript",
+            filename=lambda day_num: f"day{day_num:02d}.ts",
+            command=lambda path: ["bun", "run", str(path)],
+        ),
+        Language(
+            name="kotlin",
+            directory=REPO_ROOT / "kotlin",
+            filename=lambda day_num: f"Day{day_num:02d}.kts",
+            command=lambda path: ["kotlin", str(path)],
+        ),
+    )
+}
+
+
+def _day_num(day: str) -> int:
+    return int(day.removeprefix("day"))
+
+
+def implementations(day: str) -> dict[str, Path]:
+    day_num = _day_num(day)
+    return {
+        language.name: path
+        for language in LANGUAGES.values()
+        if (path := language.directory / language.filename(day_num)).exists()
+    }
+
+
+def days_with_several_languages() -> list[str]:
+    return [
+        day
+        for day in (f"day{day_num:02d}" for day_num in range(1, 26))
+        if len(implementations(day)) > 1
+    ]
+
+
+def scale_input(source: Path, n_lines: int, dest: Path) -> int:
+    """
+    Write the non-blank lines of `source` over and over to `dest`, until there are `n_lines` of them.
+    "Game 12:"/"Card 12:" ids are renumbered so they stay unique
+    """
+    with open(source, "r", encoding="utf-8") as f:
+        lines = [line.rstrip("\r\n") for line in f if line.strip() != ""]
+    if len(lines) == 0:
+        raise ValueError(f"{source} has no lines to scale up")
+    with open(dest, "w", encoding="utf-8") as f:
+        for record_id, line in enumerate(itertools.islice(itertools.cycle(lines), n_lines), start=1):
+            line = RE_RECORD_ID.sub(lambda match: f"{match.group(1)}{match.group(2)}{record_id}:", line)
+            f.write(f"{line}\n")
+    return n_lines
+
+
+@dataclass
+class ParityResult:
+    day: str
+    language: str
+    n_lines: int
+    startup: list[float] = field(default_factory=list)  # seconds, on a single-line input
+    wall: list[float] = field(default_factory=list)  # seconds, on the full input
+    answers: list[str] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def throughput(self) -> float | None:
+        # lines per second, once the runtime is up
+        if len(self.wall) == 0 or len(self.startup) == 0:
+            return None
+        working = statistics.median(self.wall) - statistics.median(self.startup)
+        return self.n_lines / working if working > 0 else None
+
+
+def _run(command: list[str], input_path: Path) -> tuple[float, list[str]]:
+    with tempfile.TemporaryDirectory() as work_dir:
+        shutil.copyfile(input_path, Path(work_dir) / "input.txt")
+        start = time.perf_counter()
+        proc = subprocess.run(command, cwd=work_dir, capture_output=True, text=True)
+        wall = time.perf_counter() - start
+    if proc.returncode != 0:
+        last_line = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit code {proc.returncode}"
+        raise RuntimeError(last_line)
+    return wall, [line.strip() for line in proc.stdout.splitlines() if line.strip() != ""]
+
+
+def run_parity(
+        day: str,
+        input_path: Path,
+        *,
+        languages: list[str] | None = None,
+        repeat: int = 3,
+) -> list[ParityResult]:
+    with open(input_path, "r", encoding="utf-8") as f:
+        n_lines = sum(line.strip() != "" for line in f)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        one_line_path = Path(tmp_dir) / "one_line.txt"
+        scale_input(input_path, 1, one_line_path)
+        for language_name, script_path in implementations(day).items():
+            if languages is not None and language_name not in languages:
+                continue
+            result = ParityResult(day=day, language=language_name, n_lines=n_lines)
+            results.append(result)
+            command = LANGUAGES[language_name].command(script_path)
+            if shutil.which(command[0]) is None:
+                result.error = f"{command[0]} not found"
+                continue
+            try:
+                for _ in range(repeat):
+                    result.startup.append(_run(command, one_line_path)[0])
+                    wall, result.answers = _run(command, input_path)
+                    result.wall.append(wall)
+            except RuntimeError as e:
+                result.error = str(e)
+    return results
+
+
+def n_answered(results: list[ParityResult]) -> int:
+    return sum(result.error is None for result in results)
+
+
+def answers_agree(results: list[ParityResult]) -> bool:
+    # with fewer than two languages answering there's nothing to compare, which doesn't count as agreeing
+    answers = {tuple(result.answers) for result in results if result.error is None}
+    return n_answered(results) >= 2 and len(answers) == 1
+
+
+def format_parity(results: list[ParityResult]) -> str:
+    header = ("day", "language", "startup ms", "wall ms", "lines/s", "answers")
+    rows = []
+    for result in results:
+        if result.error is not None:
+            rows.append((result.day, result.language, "", "", "", f"ERROR: {result.error}"))
+            continue
+        throughput = result.throughput
+        rows.append((
+            result.day,
+            result.language,
+            f"{1000 * statistics.median(result.startup):.1f}",
+            f"{1000 * statistics.median(result.wall):.1f}",
+            f"{throughput:,.0f}" if throughput is not None else "-",
+            " ".join(result.answers),
+        ))
+    widths = [max(len(row[i]) for row in (header, *rows)) for i in range(len(header) - 1)]
+    lines = []
+    for row in (header, *rows):
+        cells = [cell.ljust(width) if i < 2 else cell.rjust(width) for i, (cell, width) in enumerate(zip(row, widths))]
+        lines.append("  ".join(cells + [row[-1]]))
+    by_day: dict[str, list[ParityResult]] = {}
+    for result in results:
+        by_day.setdefault(result.day, []).append(result)
+    for day, day_results in by_day.items():
+        if n_answered(day_results) < 2:
+            lines.append(f"{day}: fewer than two languages answered, so there was nothing to compare")
+        elif not answers_agree(day_results):
+            lines.append(f"{day}: answers DISAGREE between languages")
+    return "\n".join(lines)
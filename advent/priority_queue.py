@@ -0,0 +1,94 @@
+import heapq
+import itertools
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+from advent import instrument
+
+T = TypeVar("T", bound=Hashable)
+Key = TypeVar("Key")
+
+_REMOVED = object()  # placeholder for the item of an entry that has been superseded
+
+
+@dataclass
+class QueueStats:
+    pushes: int = 0
+    pops: int = 0
+    stale_pops: int = 0  # superseded entries skipped over by `pop`
+    decreases: int = 0
+
+
+class PriorityQueue(Generic[T, Key]):
+    """
+    Min-heap of distinct items, with decrease-key.
+    Decreasing an item's priority leaves its old heap entry behind marked as stale (lazy deletion),
+    which `pop` skips; ties pop in insertion order.
+    Priorities come either from `push` directly or from calling `key` on the item at push time
+    """
+
+    def __init__(self, key: Callable[[T], Key] | None = None):
+        self.key = key
+        self._heap: list[list[Any]] = []  # entries are [priority, insertion number, item]
+        self._entries: dict[T, list[Any]] = {}
+        self._counter = itertools.count()
+        self.stats = QueueStats()
+        instrument.track("heap", self.stats)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, item: T) -> bool:
+        return item in self._entries
+
+    def _priority(self, item: T, priority: Key | None) -> Key:
+        if priority is not None:
+            return priority
+        if self.key is None:
+            raise ValueError("no priority given, and the queue has no key function")
+        return self.key(item)
+
+    def push(self, item: T, priority: Key | None = None) -> bool:
+        """
+        Add `item`, or move it to `priority` if it is already queued.
+        Only ever lowers the priority of a queued item; returns whether anything changed
+        """
+        priority = self._priority(item, priority)
+        old_entry = self._entries.get(item)
+        if old_entry is not None:
+            if not priority < old_entry[0]:
+                return False
+            old_entry[-1] = _REMOVED
+            self.stats.decreases += 1
+        entry = [priority, next(self._counter), item]
+        self._entries[item] = entry
+        heapq.heappush(self._heap, entry)
+        self.stats.pushes += 1
+        return True
+
+    def decrease_key(self, item: T, priority: Key):
+        old_entry = self._entries.get(item)
+        if old_entry is None:
+            raise KeyError(item)
+        if not priority < old_entry[0]:
+            raise ValueError(f"{priority=} is not lower than the current priority {old_entry[0]!r}")
+        self.push(item, priority)
+
+    def remove(self, item: T):
+        entry = self._entries.pop(item)
+        entry[-1] = _REMOVED
+
+    def pop_with_priority(self) -> tuple[Key, T]:
+        while len(self._heap) > 0:
+            priority, _, item = heapq.heappop(self._heap)
+            if item is _REMOVED:
+                self.stats.stale_pops += 1
+                continue
+            del self._entries[item]
+            self.stats.pops += 1
+            return priority, item
+        raise IndexError("pop from an empty priority queue")
+
+    def pop(self) -> T:
+        _, item = self.pop_with_priority()
+        return item
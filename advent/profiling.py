@@ -0,0 +1,218 @@
+import contextlib
+import cProfile
+import pstats
+import signal
+import sys
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+from advent import bench
+from advent.bench import DayResult, Measurement, PhaseResult
+from advent.days import DEFAULT_INPUT_PATTERN, STATE_DIR, DaySpec
+
+if TYPE_CHECKING:
+    from advent.cache import ParseCache
+
+T = TypeVar("T")
+
+DEFAULT_PROFILE_DIR = STATE_DIR / "profiles"
+DEFAULT_SAMPLE_INTERVAL = 0.001  # seconds of CPU time between stack samples
+
+# allocations made by the profiling machinery itself
+_ALLOCATION_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def can_sample_stacks() -> bool:
+    return hasattr(signal, "setitimer")
+
+
+def _frame_name(code: CodeType) -> str:
+    return f"{Path(code.co_filename).stem}:{code.co_qualname}"
+
+
+class StackSampler:
+    """
+    Samples the call stack on a CPU-time timer, for flame graphs.
+    Only sees the stack below the frame that enters it, and only works in the main thread on unix
+    """
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter[tuple[CodeType, ...]] = Counter()  # innermost frame first
+        self._root: CodeType | None = None
+        self._old_handler: Any = None
+
+    def _handle(self, signum: int, frame: FrameType | None):
+        # keep the handler cheap; frames get their names in `collapsed`
+        stack = []
+        while frame is not None and frame.f_code is not self._root:
+            stack.append(frame.f_code)
+            frame = frame.f_back
+        if frame is not None:  # otherwise the signal arrived before or after the profiled code
+            self.stacks[tuple(stack)] += 1
+
+    def __enter__(self) -> "StackSampler":
+        self._root = sys._getframe(1).f_code
+        self._old_handler = signal.signal(signal.SIGPROF, self._handle)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        return self
+
+    def __exit__(self, *exc_info):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._old_handler)
+
+    def collapsed(self) -> str:
+        # the "folded" format read by flamegraph.pl, speedscope, etc.
+        folded: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            if len(stack) > 0:
+                folded[";".join(_frame_name(code) for code in reversed(stack))] += count
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(folded.items()))
+
+
+@dataclass
+class PhaseProfile:
+    phase: str
+    stats: pstats.Stats
+    prof_path: Path
+    allocations: list[tracemalloc.StatisticDiff]  # biggest net growth first
+    collapsed_path: Path | None = None
+
+
+@dataclass
+class DayProfile:
+    result: DayResult
+    phases: list[PhaseProfile] = field(default_factory=list)
+
+
+class Profiler:
+    """
+    Drop-in for `advent.bench.measure` which also runs each phase under cProfile and tracemalloc,
+    and writes the profiles to `output_dir`
+    """
+
+    def __init__(self, day: str, output_dir: Path, *, top: int = 10, collapsed: bool = False):
+        self.day = day
+        self.output_dir = output_dir
+        self.top = top
+        self.collapsed = collapsed
+        self.phases: list[PhaseProfile] = []
+
+    def measure(self, phase: str, func: Callable[[], T], *, trace_memory: bool = False) -> tuple[Measurement, T]:
+        profile = cProfile.Profile()
+        sampler = StackSampler() if self.collapsed else None
+        snapshots = []
+        peak_memory = 0
+
+        def run() -> T:
+            nonlocal peak_memory
+            snapshots.append(tracemalloc.take_snapshot())
+            tracemalloc.reset_peak()
+            memory_start, _ = tracemalloc.get_traced_memory()
+            try:
+                with sampler or contextlib.nullcontext():
+                    profile.enable()
+                    try:
+                        return func()
+                    finally:
+                        profile.disable()
+            finally:
+                peak_memory = tracemalloc.get_traced_memory()[1] - memory_start
+                snapshots.append(tracemalloc.take_snapshot())
+
+        # generator phases are profiled from where the previous part left off until the next answer is yielded
+        measurement, result = bench.measure(phase, run)
+        measurement.peak_memory = peak_memory
+        before, after = (snapshot.filter_traces(_ALLOCATION_FILTERS) for snapshot in snapshots)
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        prof_path = self.output_dir / f"{self.day}.{phase}.prof"
+        profile.dump_stats(prof_path)
+        phase_profile = PhaseProfile(
+            phase=phase,
+            stats=pstats.Stats(profile),
+            prof_path=prof_path,
+            allocations=after.compare_to(before, "lineno")[:self.top],
+        )
+        if sampler is not None:
+            phase_profile.collapsed_path = self.output_dir / f"{self.day}.{phase}.collapsed"
+            phase_profile.collapsed_path.write_text(sampler.collapsed(), encoding="utf-8")
+        self.phases.append(phase_profile)
+        return measurement, result
+
+
+def profile_day(
+        spec: DaySpec,
+        *,
+        input_pattern: str = DEFAULT_INPUT_PATTERN,
+        output_dir: Path = DEFAULT_PROFILE_DIR,
+        top: int = 10,
+        collapsed: bool = False,
+        parse_cache: "ParseCache | None" = None,
+        stream: bool = False,
+) -> DayProfile:
+    input_path = spec.input_path(input_pattern)
+    result = DayResult(day=spec.name, input_path=str(input_path))
+    profiler = Profiler(spec.name, output_dir, top=top, collapsed=collapsed)
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        module = spec.import_module()
+        for measurement in bench.run_once(
+                spec,
+                module,
+                input_path,
+                parse_cache=parse_cache,
+                measure_phase=profiler.measure,
+                stream=stream,
+        ):
+            phase = PhaseResult(phase=measurement.phase, peak_memory=measurement.peak_memory)
+            phase.add(measurement)
+            result.phases.append(phase)
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return DayProfile(result=result, phases=profiler.phases)
+
+
+def _format_function(func: tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":  # builtins
+        return name
+    return f"{Path(filename).name}:{line}({name})"
+
+
+def format_profile(day_profile: DayProfile, *, top: int = 10) -> str:
+    day = day_profile.result.day
+    lines = []
+    for phase_profile in day_profile.phases:
+        lines.append(f"== {day} {phase_profile.phase} ({phase_profile.prof_path})")
+        lines.append("   self ms     cum ms      calls  function")
+        by_self_time = sorted(phase_profile.stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+        for func, (_, n_calls, self_time, cumulative_time, _) in by_self_time[:top]:
+            lines.append(f"{1000 * self_time:10.1f} {1000 * cumulative_time:10.1f} {n_calls:10}  {_format_function(func)}")
+        lines.append("  net KiB     blocks  allocated at")
+        for diff in phase_profile.allocations:
+            if diff.size_diff == 0:
+                continue
+            frame = diff.traceback[0]
+            lines.append(f"{diff.size_diff / 1024:9.1f} {diff.count_diff:10}  {frame.filename}:{frame.lineno}")
+        if phase_profile.collapsed_path is not None:
+            lines.append(f"collapsed stacks: {phase_profile.collapsed_path}")
+        lines.append("")
+    if day_profile.result.error is not None:
+        lines.append(f"== {day} ERROR: {day_profile.result.error}")
+    return "\n".join(lines)
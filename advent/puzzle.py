@@ -0,0 +1,141 @@
+import argparse
+import contextlib
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from pprint import pprint
+from types import ModuleType
+from typing import Any, Callable, Iterable, Iterator
+
+import numpy as np
+
+from advent import instrument
+
+Parser = Callable[[], Any]  # reads from the module's `INPUT_FILE_PATH` at call time
+Part = Callable[[Any], Any]  # from the parsed input to an answer
+StreamParser = Callable[[], Iterable[Any]]  # yields records one by one, from `INPUT_FILE_PATH`
+StreamSolver = Callable[[Iterable[Any]], tuple[Any, ...]]  # from the records to the answer of every part
+Generator = Callable[[int, np.random.Generator], Iterable[str]]  # from a size to the lines of a synthetic input
+
+
+@dataclass
+class SpanStats:
+    calls: int = 0
+    us: int = 0  # microseconds spent inside, in total
+
+
+class Puzzle:
+    """
+    What a day declares about itself, through decorators on its module-level functions:
+    its parser, its parts in order, and optionally a streaming parser and solver, and a generator of synthetic inputs.
+    The runner picks all of this up from the module's `puzzle`, and `main` runs it standalone.
+    The decorators return the functions as they are, so a day can adopt this one piece at a time
+    """
+
+    def __init__(self, module_name: str):
+        self.module_name = module_name
+        self.read_input: Parser | None = None
+        self.parts: dict[str, Part] = {}
+        self.iter_input: StreamParser | None = None
+        self.solve_stream: StreamSolver | None = None
+        self.generate: Generator | None = None
+        self._spans: dict[str, SpanStats] = {}
+
+    @property
+    def module(self) -> ModuleType:
+        return sys.modules[self.module_name]
+
+    @property
+    def name(self) -> str:
+        # the module is `__main__` when run as a script
+        return Path(self.module.__file__).stem
+
+    def parser(self, func: Parser) -> Parser:
+        self.read_input = func
+        return func
+
+    def part(self, func: Part | None = None, *, name: str | None = None):
+        # named "part1", "part2", ... in the order they're declared, unless given a `name`
+        if func is None:
+            return lambda f: self.part(f, name=name)
+        if name is None:
+            name = f"part{len(self.parts) + 1}"
+        if name in self.parts:
+            raise ValueError(f"{self.name} already has a part named {name!r}")
+        self.parts[name] = func
+        return func
+
+    def stream_parser(self, func: StreamParser) -> StreamParser:
+        self.iter_input = func
+        return func
+
+    def stream_solver(self, func: StreamSolver) -> StreamSolver:
+        self.solve_stream = func
+        return func
+
+    def generator(self, func: Generator) -> Generator:
+        self.generate = func
+        return func
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.iter_input is not None and self.solve_stream is not None
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """
+        Time a stretch of a part; the runner reports the calls and total time, as e.g. "span.day09.extrapolate.us"
+        """
+        stats = self._spans.get(name)
+        if stats is None:
+            stats = self._spans[name] = SpanStats()
+            instrument.register(f"span.{self.name}.{name}", stats)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            stats.calls += 1
+            stats.us += (time.perf_counter_ns() - start) // 1000
+
+    def solve(self, input_: Any) -> Iterator[Any]:
+        for part in self.parts.values():
+            yield part(input_)
+
+    def main(self, argv: list[str] | None = None):
+        module = self.module
+        parser = argparse.ArgumentParser(prog=f"python {self.name}.py")
+        parser.add_argument("input", nargs="?", help=f"input file path (default: {module.INPUT_FILE_PATH})")
+        parser.add_argument(
+            "--stream", action="store_true", help="parse and solve every part in one pass, if the day supports it",
+        )
+        parser.add_argument("--time", action="store_true", help="print how long each phase and span took, to stderr")
+        args = parser.parse_args(argv)
+        if args.input is not None:
+            module.INPUT_FILE_PATH = Path(args.input)
+        timings = []
+
+        def timed(phase: str, func: Callable[[], Any]) -> Any:
+            start = time.perf_counter()
+            result = func()
+            timings.append((phase, time.perf_counter() - start))
+            return result
+
+        with instrument.collect() as counters:
+            if args.stream and self.supports_streaming:
+                for answer in timed("stream", lambda: self.solve_stream(self.iter_input())):
+                    pprint(answer)
+            else:
+                input_ = timed("read_input", self.read_input)
+                for part_name, part in self.parts.items():
+                    pprint(timed(part_name, lambda: part(input_)))
+        if args.time:
+            for phase, seconds in timings:
+                print(f"{phase}: {1000 * seconds:.2f} ms", file=sys.stderr)
+            for counter_name, value in sorted(counters.items()):
+                print(f"{counter_name}: {value}", file=sys.stderr)
+
+
+def puzzle_of(module: ModuleType) -> Puzzle | None:
+    puzzle = getattr(module, "puzzle", None)
+    return puzzle if isinstance(puzzle, Puzzle) else None
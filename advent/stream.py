@@ -0,0 +1,34 @@
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Iterator
+
+from advent.puzzle import puzzle_of
+
+
+def iter_lines(path: Path) -> Iterator[str]:
+    """
+    Stripped, non-blank lines of a text file, read lazily.
+    Only one line is held in memory at a time, however big the file is
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if (line := line.strip()) != "":
+                yield line
+
+
+def supports_streaming(module: ModuleType) -> bool:
+    # a streaming day parses records with `iter_input` and folds all its parts over them with `solve_stream`
+    if (puzzle := puzzle_of(module)) is not None:
+        return puzzle.supports_streaming
+    return hasattr(module, "iter_input") and hasattr(module, "solve_stream")
+
+
+def solve_stream(module: ModuleType, input_path: Path) -> tuple[Any, ...]:
+    """
+    Answers of every part of a streaming day, from a single pass over the input file.
+    The day's `solve_stream` folds every part over each record as it's read, so the input is never held in memory
+    """
+    module.INPUT_FILE_PATH = input_path
+    if (puzzle := puzzle_of(module)) is not None:
+        return puzzle.solve_stream(puzzle.iter_input())
+    return module.solve_stream(module.iter_input())
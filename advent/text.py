@@ -0,0 +1,62 @@
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+NEWLINE = ord("\n")
+ZERO = ord("0")
+CHUNK_SIZE = 1 << 22  # bytes of text handled at once, which bounds the size of the temporary arrays built from them
+
+
+def load_bytes(path: Path) -> np.ndarray:
+    """
+    Memory-map a file and view it as a read-only 1D uint8 array, without copying.
+    It's an `np.memmap`, so it knows the `filename` it came from, and other processes can map the same file
+    """
+    if path.stat().st_size == 0:  # empty files can't be mapped
+        return np.zeros(0, dtype=np.uint8)
+    return np.memmap(path, dtype=np.uint8, mode="r")
+
+
+def _end_of_line(data: np.ndarray, start: int) -> int:
+    # just past the first newline at or after `start`, looking through windows that double in size
+    window = 4096
+    while start < len(data):
+        newlines = np.flatnonzero(data[start:(start + window)] == NEWLINE)
+        if len(newlines) > 0:
+            return start + int(newlines[0]) + 1
+        start += window
+        window *= 2
+    return len(data)
+
+
+def line_chunks(data: np.ndarray, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[int, int]]:
+    """
+    Split a text buffer into (start, end) ranges of about `chunk_size` bytes, each ending just after a newline
+    (or at the end of the buffer), so no line is ever split between two of them
+    """
+    start = 0
+    while start < len(data):
+        end = _end_of_line(data, min(start + chunk_size, len(data)) - 1)
+        yield start, end
+        start = end
+
+
+def find_numbers(data: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Every run of ascii digits in a 1D byte array: where each one starts, where it ends (exclusive), and its value
+    """
+    digits = data - ZERO  # bytes below "0" wrap around to high values
+    is_digit = digits < 10
+    is_first = is_digit.copy()
+    is_first[1:] &= ~is_digit[:-1]
+    is_last = is_digit.copy()
+    is_last[:-1] &= ~is_digit[1:]
+    starts = np.flatnonzero(is_first)
+    ends = np.flatnonzero(is_last) + 1
+    lengths = ends - starts
+    values = digits[starts].astype(np.int64)
+    for place in range(1, int(lengths.max(initial=0))):
+        has_place = np.flatnonzero(lengths > place)
+        values[has_place] = 10 * values[has_place] + digits[starts[has_place] + place]
+    return starts, ends, values
@@ -1,29 +1,42 @@
+import itertools
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from pprint import pprint
+from typing import Iterable, Iterator
 
-Input = list[str]
+import numpy as np
+
+from advent.stream import iter_lines
+from advent.text import CHUNK_SIZE, NEWLINE, line_chunks, load_bytes
+
+Input = np.ndarray  # the bytes of the whole file, as uint8
 
 INPUT_FILE_PATH = Path("input.txt")
+# a cached copy of the bytes would be no faster to load, and it isn't a memory map, which the workers need
+CACHE_PARSED_INPUT = False
+
+# processes to split the decoding of a memory-mapped input between; `python -m advent bench --workers` sets this
+N_WORKERS = 1
+CHUNKS_PER_WORKER = 4  # so a worker that finishes early can pick up more
+
+
+def iter_input() -> Iterator[str]:
+    return iter_lines(INPUT_FILE_PATH)
 
 
 def read_input() -> Input:
-    with open(INPUT_FILE_PATH, "r", encoding="utf-8") as f:
-        return [
-            line_
-            for line in f
-            if (line_ := line.strip()) != ""
-        ]
+    return load_bytes(INPUT_FILE_PATH)
+
+
+def calibration_value1(line: str) -> int:
+    first = re.search(r"\d", line).group(0)
+    last = re.search(r"\d", line[::-1]).group(0)
+    return int(f"{first}{last}")
 
 
 def solve1(input_: Input) -> int:
-    total = 0
-    for line in input_:
-        first = re.search(r"\d", line).group(0)
-        last = re.search(r"\d", line[::-1]).group(0)
-        number = int(f"{first}{last}")
-        total += number
-    return total
+    return calibration_total(input_, spelled=False, n_workers=N_WORKERS)
 
 
 DIGITS_BY_NAME = {
@@ -45,17 +58,97 @@ def to_digit(num: str) -> str:
     return DIGITS_BY_NAME[num]
 
 
+UNION_DIGIT_NAMES = "|".join(DIGITS_BY_NAME.keys())
+RE_DIGITS_FORWARD = re.compile(fr"\d|{UNION_DIGIT_NAMES}")
+RE_DIGITS_BACKWARD = re.compile(fr"\d|{UNION_DIGIT_NAMES[::-1]}")
+
+
+def calibration_value2(line: str) -> int:
+    first = RE_DIGITS_FORWARD.search(line).group(0)
+    last = RE_DIGITS_BACKWARD.search(line[::-1]).group(0)[::-1]
+    return int(f"{to_digit(first)}{to_digit(last)}")
+
+
+ZERO = ord("0")
+# every digit name has a different 2-letter prefix, which picks out which name (if any) could start at a byte;
+# this maps each prefix, as a little-endian uint16, to the index of its name, or -1
+NAMES = list(DIGITS_BY_NAME)
+NAME_BY_PREFIX = np.full(1 << 16, -1, dtype=np.int8)
+for _i, _name in enumerate(NAMES):
+    NAME_BY_PREFIX[int.from_bytes(_name[:2].encode("ascii"), "little")] = _i
+
+
+def digit_values(data: np.ndarray, *, spelled: bool) -> np.ndarray:
+    """
+    The digit that starts at each byte, or anything over 9 where there isn't one. With `spelled`, digit names count too.
+    Names never contain one another, so where they overlap (like "twone") each one still starts a digit;
+    the first and last per line are then the same ones the forward and backward regex searches find
+    """
+    values = data - ZERO  # a new array; bytes below "0" wrap around to high values
+    if not spelled or len(data) < 2:
+        return values
+    names = NAME_BY_PREFIX[data[:-1].astype(np.uint16) | data[1:].astype(np.uint16) << 8]
+    candidates = np.flatnonzero(names >= 0)
+    names = names[candidates]
+    for i, name in enumerate(NAMES):
+        starts = candidates[names == i]
+        starts = starts[starts + len(name) <= len(data)]
+        is_match = np.ones(len(starts), dtype=bool)
+        for offset, char in enumerate(name[2:].encode("ascii"), start=2):
+            is_match &= data[starts + offset] == char
+        values[starts[is_match]] = int(DIGITS_BY_NAME[name])
+    return values
+
+
+def _chunk_total(data: np.ndarray, *, spelled: bool) -> int:
+    values = digit_values(data, spelled=spelled)
+    is_digit = values < 10
+    # digits and newlines, in order, so the digits just after and just before a newline start and end their lines
+    events = np.flatnonzero(is_digit | (data == NEWLINE))
+    if len(events) == 0:
+        return 0
+    event_values = values[events]
+    is_event_digit = event_values < 10
+    is_first = is_event_digit.copy()
+    is_first[1:] &= ~is_event_digit[:-1]
+    is_last = is_event_digit.copy()
+    is_last[:-1] &= ~is_event_digit[1:]
+    firsts = event_values[is_first].astype(np.int64)
+    lasts = event_values[is_last].astype(np.int64)
+    return int(10 * firsts.sum() + lasts.sum())
+
+
+def _range_total(path: str, start: int, end: int, spelled: bool) -> int:
+    # runs in a worker process, which maps the file for itself, so only these few arguments get pickled
+    return calibration_total(load_bytes(Path(path))[start:end], spelled=spelled)
+
+
+def calibration_total(data: np.ndarray, *, spelled: bool, n_workers: int = 1) -> int:
+    """
+    The sum of the calibration values of every line, decoded straight from the bytes of the file;
+    no line is ever split into its own string, or reversed.
+    If `data` is a whole memory-mapped file, `n_workers` processes can each decode some newline-aligned ranges of it
+    """
+    path = getattr(data, "filename", None)
+    if n_workers > 1 and path is not None and len(data) > CHUNK_SIZE:
+        range_size = max(CHUNK_SIZE, -(-len(data) // (n_workers * CHUNKS_PER_WORKER)))
+        starts, ends = zip(*line_chunks(data, range_size))
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(starts))) as pool:
+            return sum(pool.map(_range_total, itertools.repeat(path), starts, ends, itertools.repeat(spelled)))
+    return sum(_chunk_total(data[start:end], spelled=spelled) for start, end in line_chunks(data))
+
+
 def solve2(input_: Input) -> int:
-    union_digit_names = "|".join(DIGITS_BY_NAME.keys())
-    re_digits_forward = re.compile(fr"\d|{union_digit_names}")
-    re_digits_backward = re.compile(fr"\d|{union_digit_names[::-1]}")
-    total = 0
-    for line in input_:
-        first = re_digits_forward.search(line).group(0)
-        last = re_digits_backward.search(line[::-1]).group(0)[::-1]
-        number = int(f"{to_digit(first)}{to_digit(last)}")
-        total += number
-    return total
+    return calibration_total(input_, spelled=True, n_workers=N_WORKERS)
+
+
+def solve_stream(lines: Iterable[str]) -> tuple[int, int]:
+    total1 = 0
+    total2 = 0
+    for line in lines:
+        total1 += calibration_value1(line)
+        total2 += calibration_value2(line)
+    return total1, total2
 
 
 def main():
@@ -3,61 +3,168 @@ import re
 from collections import defaultdict
 from pathlib import Path
 from pprint import pprint
+from typing import Iterable, Iterator, NamedTuple
 
-Input = dict[int, list[tuple[str, int]]]
+import numpy as np
+
+from advent.stream import iter_lines
+from advent.text import find_numbers, line_chunks, load_bytes
+
+Game = tuple[int, list[tuple[str, int]]]  # game number, and (color, count) of each pull
 
 INPUT_FILE_PATH = Path("input.txt")
 
+MAX_TABLE_SIZE = 1 << 24  # cells in the table that answers many bags at once; see `solve1_many`
+
 COLOR_MAXES = {
     "red": 12,
     "green": 13,
     "blue": 14,
 }
 COLORS = set(COLOR_MAXES.keys())
+COLOR_NAMES = tuple(COLOR_MAXES)  # the code of a color is its index in here
 
 RE_COLOR_COUNT = re.compile(fr"(\d+)\s+({'|'.join(COLORS)})")
 
+COLON = ord(":")
+# color codes by the first letter of the color's name, which are all different; -1 for any other byte
+COLOR_CODES = np.full(256, -1, dtype=np.int8)
+for _code, _name in enumerate(COLOR_NAMES):
+    COLOR_CODES[ord(_name[0])] = _code
+
+
+class Games(NamedTuple):
+    ids: np.ndarray  # game number of each game
+    starts: np.ndarray  # index of the first pull of each game, into the pull columns
+    colors: np.ndarray  # color code of each pull
+    counts: np.ndarray  # count of each pull
+    maxes: np.ndarray  # (game, color code): the most of that color shown in any one pull of the game
+
+
+Input = Games
+
+
+def iter_input() -> Iterator[Game]:
+    for line in iter_lines(INPUT_FILE_PATH):
+        match = re.match(r"Game (\d+):", line)
+        game_num = int(match.group(1))
+        pulls = re.split("[,;]", line[match.end():])
+        pulls = [
+            (match.group(2), int(match.group(1)))
+            for pull in pulls
+            if (match := RE_COLOR_COUNT.search(pull)) is not None
+        ]
+        yield game_num, pulls
+
+
+def _parse_chunk(data: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    starts, ends, values = find_numbers(data)
+    last = len(data) - 1
+    is_id = data[np.minimum(ends, last)] == COLON
+    colors = COLOR_CODES[data[np.minimum(ends + 1, last)]]
+    is_pull = ~is_id
+    if np.any(is_pull & (colors < 0)):
+        raise ValueError(f"can't tell what the number at byte {int(starts[is_pull & (colors < 0)][0])} is for")
+    pull_starts = np.cumsum(is_pull)[is_id]  # no. of pulls before each game
+    return values[is_id], pull_starts, colors[is_pull].astype(np.intp), values[is_pull]
+
+
+def parse_games(data: np.ndarray) -> Games:
+    """
+    Every number in the input is either a game number (followed by ":") or a count (followed by a color),
+    so the whole file can be parsed at once from its bytes; a chunk of lines at a time, to bound the memory needed
+    """
+    ids, starts, colors, counts = [], [], [], []
+    n_pulls = 0
+    for start, end in list(line_chunks(data)) or [(0, 0)]:
+        chunk_ids, chunk_starts, chunk_colors, chunk_counts = _parse_chunk(data[start:end])
+        ids.append(chunk_ids)
+        starts.append(chunk_starts + n_pulls)
+        colors.append(chunk_colors)
+        counts.append(chunk_counts)
+        n_pulls += len(chunk_counts)
+    games = Games(
+        ids=np.concatenate(ids),
+        starts=np.concatenate(starts),
+        colors=np.concatenate(colors),
+        counts=np.concatenate(counts),
+        maxes=np.zeros(0),
+    )
+    return games._replace(maxes=max_per_color(games.starts, games.colors, games.counts))
+
+
+def max_per_color(starts: np.ndarray, colors: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    n_pulls = len(counts)
+    # an extra row of zeros, so games with no pulls at the very end still have a row to start at
+    by_color = np.zeros((n_pulls + 1, len(COLOR_NAMES)), dtype=np.int64)
+    by_color[np.arange(n_pulls), colors] = counts
+    if len(starts) == 0:
+        return np.zeros((0, len(COLOR_NAMES)), dtype=np.int64)
+    maxes = np.maximum.reduceat(by_color, starts, axis=0)
+    maxes[np.diff(starts, append=n_pulls) == 0] = 0  # `reduceat` gives games with no pulls the next game's first pull
+    return maxes
+
 
 def read_input() -> Input:
-    data = {}
-    with open(INPUT_FILE_PATH, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line == "":
-                continue
-            match = re.match(r"Game (\d+):", line)
-            game_num = int(match.group(1))
-            pulls = re.split("[,;]", line[match.end():])
-            pulls = [
-                (match.group(2), int(match.group(1)))
-                for pull in pulls
-                if (match := RE_COLOR_COUNT.search(pull)) is not None
-            ]
-            data[game_num] = pulls
-    return data
+    return parse_games(load_bytes(INPUT_FILE_PATH))
 
 
-def solve1(input_: Input) -> int:
-    return sum(
-        game_num
-        for game_num, pulls in input_.items()
-        if all(
-            count <= COLOR_MAXES[color]
-            for color, count in pulls
-        )
+def is_possible(pulls: list[tuple[str, int]]) -> bool:
+    return all(
+        count <= COLOR_MAXES[color]
+        for color, count in pulls
     )
 
 
+def power(pulls: list[tuple[str, int]]) -> int:
+    biggest_seen = defaultdict(int)
+    for color, count in pulls:
+        best_prev = biggest_seen[color]
+        biggest_seen[color] = max(best_prev, count)
+    return math.prod((biggest_seen[color] for color in COLORS))
+
+
+def bag_array(bags: Iterable[dict[str, int]]) -> np.ndarray:
+    rows = [[bag[color] for color in COLOR_NAMES] for bag in bags]
+    return np.array(rows, dtype=np.int64).reshape(-1, len(COLOR_NAMES))
+
+
+def solve1_many(input_: Input, bags: Iterable[dict[str, int]]) -> list[int]:
+    """
+    The answer to part 1 for each of many bags, each given like `COLOR_MAXES`, all at once.
+    The game numbers are tallied by each game's maxes, then summed cumulatively along every color,
+    so each cell holds the answer for a bag with those maxes, and each bag is just a lookup
+    """
+    bag_maxes = bag_array(bags)
+    top = int(input_.maxes.max(initial=0))
+    shape = (top + 1,) * len(COLOR_NAMES)
+    if math.prod(shape) > MAX_TABLE_SIZE:  # counts too big for a table; compare against every game instead
+        return [int(input_.ids[np.all(input_.maxes <= bag, axis=1)].sum()) for bag in bag_maxes]
+    table = np.zeros(shape, dtype=np.int64)
+    np.add.at(table, tuple(input_.maxes.T), input_.ids)
+    for axis in range(table.ndim):
+        np.cumsum(table, axis=axis, out=table)
+    answers = table[tuple(bag_maxes.clip(0, top).T)]
+    answers[np.any(bag_maxes < 0, axis=1)] = 0  # no game fits, since even one with no pulls of a color has 0 of it
+    return answers.tolist()
+
+
+def solve1(input_: Input) -> int:
+    return solve1_many(input_, [COLOR_MAXES])[0]
+
+
 def solve2(input_: Input) -> int:
+    return int(np.prod(input_.maxes, axis=1).sum())
+
+
+def solve_stream(games: Iterable[Game]) -> tuple[int, int]:
+    total = 0
     total_power = 0
-    for pulls in input_.values():
-        biggest_seen = defaultdict(int)
-        for color, count in pulls:
-            best_prev = biggest_seen[color]
-            biggest_seen[color] = max(best_prev, count)
-        power = math.prod((biggest_seen[color] for color in COLORS))
-        total_power += power
-    return total_power
+    for game_num, pulls in games:
+        if is_possible(pulls):
+            total += game_num
+        total_power += power(pulls)
+    return total, total_power
 
 
 # def solve2(input_: Input) -> int:
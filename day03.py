@@ -1,106 +1,186 @@
+import itertools
+import re
+from bisect import bisect_left
+from collections import deque
 from pathlib import Path
 from pprint import pprint
-from typing import Sequence
+from typing import Iterable, Iterator, NamedTuple
 
 import numpy as np
 
-EMPTY = "."
-GEAR = "*"
+from advent.grid import ByteGrid, load_byte_grid
+from advent.stream import iter_lines
+from advent.text import find_numbers
 
-Input = list[list[str]]
+# ascii codes, to match the byte grid
+EMPTY = ord(".")
+GEAR = ord("*")
+ZERO = ord("0")
+NINE = ord("9")
 
-INPUT_FILE_PATH = Path("input.txt")
-
-
-def read_input() -> Input:
-    with open(INPUT_FILE_PATH, "r", encoding="utf-8") as f:
-        return [
-            list(line.strip())
-            for line in f.readlines()
-        ]
+Input = ByteGrid
 
+INPUT_FILE_PATH = Path("input.txt")
 
-def is_symbol(s: str) -> bool:
-    return not (s.isdigit() or s == EMPTY)
+RE_NUMBER = re.compile(r"[0-9]+")
+RE_SYMBOL = re.compile(r"[^.0-9]")
 
 
-def _count_digits(row: Sequence[str]) -> int:
-    assert row[0].isdigit()
-    for i, s in enumerate(row[1:], start=1):
-        if not s.isdigit():
-            return i
-    return len(row)
+def read_input() -> Input:
+    return load_byte_grid(INPUT_FILE_PATH)
+
+
+class Spans(NamedTuple):
+    """
+    Every number in the schematic, by id: its value, and the row and [start, end) columns it covers
+    """
+    values: np.ndarray
+    rows: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+    labels: np.ndarray  # (row, col): id of the number covering that cell, or -1
+
+
+def label_numbers(grid: ByteGrid) -> Spans:
+    n_rows, n_cols = grid.shape
+    # a column of "." after every row, so numbers don't run on from one row into the next
+    padded = np.full((n_rows, n_cols + 1), EMPTY, dtype=np.uint8)
+    padded[:, :n_cols] = grid
+    starts, ends, values = find_numbers(padded.ravel())
+    lengths = ends - starts
+    label_type = np.int32 if len(starts) < np.iinfo(np.int32).max else np.int64
+    labels = np.full(padded.size, -1, dtype=label_type)
+    labels[(padded.ravel() - ZERO) < 10] = np.repeat(np.arange(len(starts), dtype=label_type), lengths)
+    rows, start_cols = np.divmod(starts, n_cols + 1)
+    return Spans(
+        values=values,
+        rows=rows,
+        starts=start_cols,
+        ends=start_cols + lengths,
+        labels=labels.reshape(n_rows, n_cols + 1)[:, :n_cols],
+    )
+
+
+def is_symbol(grid: ByteGrid) -> np.ndarray:
+    return (grid != EMPTY) & ((grid < ZERO) | (grid > NINE))
+
+
+def dilate(mask: np.ndarray) -> np.ndarray:
+    # true wherever the cell or any of its 8 neighbors is; along the rows, then along the columns
+    wide = mask.copy()
+    wide[:, 1:] |= mask[:, :-1]
+    wide[:, :-1] |= mask[:, 1:]
+    out = wide.copy()
+    out[1:] |= wide[:-1]
+    out[:-1] |= wide[1:]
+    return out
 
 
 class Solver:
+    """
+    Labels every number once, so each part is a few passes over the whole grid
+    """
+
     def __init__(self, input_: Input):
-        self.input = np.array(input_)
-
-    def _has_symbol_neighbor(self, r: int, c_start: int, n: int) -> bool:
-        rows_to_check = list(filter(lambda r_: 0 <= r_ < self.input.shape[0], [r - 1, r, r + 1]))
-        # left bookend
-        c_left = c_start - 1
-        if c_left >= 0:
-            for new_r in rows_to_check:
-                if is_symbol(self.input[new_r, c_left]):
-                    return True
-        # right bookend
-        c_right = c_start + n
-        if c_right < self.input.shape[1]:
-            for new_r in rows_to_check:
-                if is_symbol(self.input[new_r, c_right]):
-                    return True
-        # all along the number
-        rows_to_check.remove(r)
-        for new_c in range(c_start, c_start + n):
-            for new_r in rows_to_check:
-                if is_symbol(self.input[new_r, new_c]):
-                    return True
-        # nothing found
-        return False
+        self.input = np.asarray(input_)
+        self.spans = label_numbers(self.input)
 
     def solve1(self) -> int:
-        data = self.input.copy()
-        total = 0
-        for r in range(data.shape[0]):
-            for c in range(data.shape[1]):
-                if data[r, c].isdigit():
-                    n_digits = _count_digits(data[r, c:])
-                    if self._has_symbol_neighbor(r, c, n_digits):
-                        num = int("".join(data[r, c:c + n_digits]))
-                        total += num
-                    data[r, c:c + n_digits] = EMPTY
-        return total
-
-    def _collect_adjacent_numbers(self, r: int, c: int) -> list[int]:
-        data = self.input.copy()
-        adjacent_numbers = []
+        labels = self.spans.labels
+        near_symbol = dilate(is_symbol(self.input)) & (labels >= 0)
+        is_part = np.zeros(len(self.spans.values), dtype=bool)
+        is_part[labels[near_symbol]] = True
+        return int(self.spans.values[is_part].sum())
+
+    def solve2(self) -> int:
+        gear_rows, gear_cols = np.nonzero(self.input == GEAR)
+        labels = self.spans.labels
+        n_rows, n_cols = labels.shape
+        around = []
         for r_shift in (-1, 0, 1):
-            new_r = r + r_shift
-            for c_shift in (-1, 0, 1):  # order is important
+            for c_shift in (-1, 0, 1):
                 if r_shift == 0 and c_shift == 0:
                     continue
-                new_c = c + c_shift
-                if data[new_r, new_c].isdigit():
-                    c_start = new_c
-                    while c_start > 0 and data[new_r, c_start - 1].isdigit():
-                        c_start -= 1
-                    n_digits = _count_digits(data[new_r, c_start:])
-                    num = int("".join(data[new_r, c_start:c_start + n_digits]))
-                    adjacent_numbers.append(num)
-                    data[new_r, c_start:c_start + n_digits] = EMPTY
-        return adjacent_numbers
-
-    def solve2(self) -> int:
-        total = 0
-        for r in range(self.input.shape[0]):
-            for c in range(self.input.shape[1]):
-                if self.input[r, c] == GEAR:
-                    adjacent_numbers = self._collect_adjacent_numbers(r, c)
-                    if len(adjacent_numbers) == 2:
-                        gear_ratio = adjacent_numbers[0] * adjacent_numbers[1]
-                        total += gear_ratio
-        return total
+                rows = gear_rows + r_shift
+                cols = gear_cols + c_shift
+                on_grid = (rows >= 0) & (rows < n_rows) & (cols >= 0) & (cols < n_cols)
+                around.append(np.where(on_grid, labels[rows.clip(0, n_rows - 1), cols.clip(0, n_cols - 1)], -1))
+        around = np.stack(around, axis=1)
+        around.sort(axis=1)
+        is_new = (around >= 0) & (around != np.pad(around, ((0, 0), (1, 0)), constant_values=-1)[:, :-1])
+        is_ratio = np.count_nonzero(is_new, axis=1) == 2
+        # with exactly 2 different numbers around a gear, they're the biggest and the smallest id that isn't -1
+        around = around[is_ratio]
+        first = around[:, -1]
+        second = np.where(around >= 0, around, first[:, np.newaxis]).min(axis=1)
+        values = self.spans.values
+        return int((values[first] * values[second]).sum())
+
+
+class Row(NamedTuple):
+    numbers: list[tuple[int, int, int]]  # [start, end) columns and value of each number, from left to right
+    symbols: list[int]  # columns, in order
+    gears: list[int]  # columns, in order
+
+
+EMPTY_ROW = Row([], [], [])
+
+
+def iter_input() -> Iterator[Row]:
+    for line in iter_lines(INPUT_FILE_PATH):
+        symbols = []
+        gears = []
+        for match in RE_SYMBOL.finditer(line):
+            symbols.append(col := match.start())
+            if match.group() == "*":
+                gears.append(col)
+        numbers = [(match.start(), match.end(), int(match.group())) for match in RE_NUMBER.finditer(line)]
+        yield Row(numbers, symbols, gears)
+
+
+def _has_symbol_between(symbols: list[int], c_min: int, c_max: int) -> bool:
+    i = bisect_left(symbols, c_min)
+    return i < len(symbols) and symbols[i] <= c_max
+
+
+def _numbers_around(row: Row, c: int) -> Iterator[int]:
+    # the numbers that cover any of columns c - 1 to c + 1; one number can't reach past another
+    i = bisect_left(row.numbers, (c - 1,))
+    if i > 0 and row.numbers[i - 1][1] >= c:  # starts further left, but reaches in
+        i -= 1
+    while i < len(row.numbers) and row.numbers[i][0] <= c + 1:
+        yield row.numbers[i][2]
+        i += 1
+
+
+def scan_rows(rows: Iterable[Row]) -> Iterator[tuple[list[int], list[int]]]:
+    """
+    The part numbers and gear ratios in each row, as soon as the row after it has been read.
+    Only three rows are held at a time, so memory stays flat however tall the schematic is
+    """
+    window: deque[Row] = deque([EMPTY_ROW], maxlen=3)
+    for row in itertools.chain(rows, [EMPTY_ROW]):
+        window.append(row)
+        if len(window) < 3:
+            continue
+        above, middle, below = window
+        symbols = sorted(above.symbols + middle.symbols + below.symbols)
+        part_numbers = [value for start, end, value in middle.numbers if _has_symbol_between(symbols, start - 1, end)]
+        gear_ratios = []
+        for c in middle.gears:
+            adjacent = [value for neighbor in window for value in _numbers_around(neighbor, c)]
+            if len(adjacent) == 2:
+                gear_ratios.append(adjacent[0] * adjacent[1])
+        yield part_numbers, gear_ratios
+
+
+def solve_stream(rows: Iterable[Row]) -> tuple[int, int]:
+    total_part_numbers = 0
+    total_gear_ratios = 0
+    for part_numbers, gear_ratios in scan_rows(rows):
+        total_part_numbers += sum(part_numbers)
+        total_gear_ratios += sum(gear_ratios)
+    return total_part_numbers, total_gear_ratios
 
 
 def main():
@@ -1,40 +1,149 @@
+from collections import deque
 from pathlib import Path
 from pprint import pprint
+from typing import Iterable, Iterator
+
 import numpy as np
 
-Input = list[tuple[list[int], list[int]]]
+from advent.stream import iter_lines
+from advent.text import find_numbers, line_chunks, load_bytes
+
+Card = tuple[list[int], list[int]]
 
 INPUT_FILE_PATH = Path("input.txt")
 
+WORD_BITS = 64
+MAX_BITMASK_WORDS = 16  # so numbers up to 1023; chunks with bigger ones match through sorted pairs instead
+
+COLON = ord(":")
+BAR = ord("|")
+POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+Input = np.ndarray  # no. of held numbers that are winning numbers, of each card
+
+
+def iter_input() -> Iterator[Card]:
+    for line in iter_lines(INPUT_FILE_PATH):
+        yield tuple(map(lambda raw_half: list(map(int, raw_half.split())), line.split(":")[1].split("|")))
+
+
+def to_bitmasks(cards: np.ndarray, values: np.ndarray, n_cards: int, n_words: int) -> np.ndarray:
+    # bit n of a card's row is set if n is one of its numbers
+    has_number = np.zeros((n_cards, n_words * WORD_BITS), dtype=bool)
+    has_number[cards, values] = True
+    return np.packbits(has_number, axis=1, bitorder="little").view(np.uint64)
+
+
+def count_bitmask_matches(winning: np.ndarray, held: np.ndarray) -> np.ndarray:
+    both = np.ascontiguousarray(winning & held)
+    return POPCOUNT[both.view(np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+def count_pair_matches(winning: np.ndarray, held: np.ndarray, n_cards: int) -> np.ndarray:
+    """
+    Matches from (card, number) rows, for numbers too big for bitmasks.
+    Repeats within each side are dropped, so held numbers count once like they do in bitmasks,
+    and then every row that shows up on both sides is a match
+    """
+    pairs = np.concatenate([np.unique(winning, axis=0), np.unique(held, axis=0)])
+    pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+    is_match = np.all(pairs[1:] == pairs[:-1], axis=1)
+    return np.bincount(pairs[1:, 0][is_match], minlength=n_cards).astype(np.int64)
+
+
+def _parse_chunk(data: np.ndarray) -> np.ndarray:
+    starts, ends, values = find_numbers(data)
+    n_cards = np.count_nonzero(data == COLON)
+    # each card has a ":" and then a "|", so a number's section is told by how many of each come before it
+    n_colons_before = np.searchsorted(np.flatnonzero(data == COLON), starts)
+    n_bars_before = np.searchsorted(np.flatnonzero(data == BAR), starts)
+    is_card_id = data[np.minimum(ends, len(data) - 1)] == COLON
+    is_winning = ~is_card_id & (n_bars_before < n_colons_before)
+    is_held = ~is_card_id & (n_bars_before == n_colons_before)
+    cards = n_colons_before - 1
+    n_words = int(values[~is_card_id].max(initial=0)) // WORD_BITS + 1
+    if n_words > MAX_BITMASK_WORDS:
+        return count_pair_matches(
+            np.stack([cards[is_winning], values[is_winning]], axis=1),
+            np.stack([cards[is_held], values[is_held]], axis=1),
+            n_cards,
+        )
+    return count_bitmask_matches(
+        to_bitmasks(cards[is_winning], values[is_winning], n_cards, n_words),
+        to_bitmasks(cards[is_held], values[is_held], n_cards, n_words),
+    )
+
+
+def parse_cards(data: np.ndarray) -> Input:
+    """
+    The matches of every card, parsed from the file's bytes a chunk of lines at a time.
+    Each chunk's winning and held numbers become bitmasks, so its matches come from a single AND and popcount
+    """
+    chunks = [_parse_chunk(data[start:end]) for start, end in line_chunks(data)]
+    return np.concatenate(chunks) if len(chunks) > 0 else np.zeros(0, dtype=np.int64)
+
 
 def read_input() -> Input:
-    with open(INPUT_FILE_PATH, "r", encoding="utf-8") as f:
-        return [
-            tuple(map(lambda raw_half: list(map(int, raw_half.split())), line.split(":")[1].split("|")))
-            for line in f.readlines()
-        ]
+    return parse_cards(load_bytes(INPUT_FILE_PATH))
+
+
+def count_matches(card: Card) -> int:
+    winning, yours = card
+    winning = set(winning)
+    # a held number that's repeated still counts once, like in `parse_cards`
+    return sum(num in winning for num in set(yours))
+
+
+def score(count: int) -> int:
+    if count == 0:
+        return 0
+    return 2 ** (count - 1)
 
 
 def solve1(input_: Input) -> int:
+    # cards tallied by their no. of matches, since scores can outgrow 64 bits
+    n_cards_by_count = np.bincount(input_)
+    return sum(n_cards * score(count) for count, n_cards in enumerate(n_cards_by_count.tolist()))
+
+
+def total_copies(matches: list[int]) -> int:
+    """
+    The copies a card wins go to a run of the cards right after it, so they're added into a difference array
+    where the run starts and taken back out just past its end; a running sum then gives each card's copies in O(1).
+    Python ints, so copy counts stay exact long after they'd overflow 64 bits
+    """
+    diff = [0] * (len(matches) + max(matches, default=0) + 1)
     total = 0
-    for winning, yours in input_:
-        winning = set(winning)
-        count = sum(num in winning for num in yours)
-        if count == 0:
-            score = 0
-        else:
-            score = 2 ** (count - 1)
-        total += score
+    n_copies = 1  # the original; never taken back out
+    for i, count in enumerate(matches):
+        n_copies += diff[i]
+        total += n_copies
+        if count:
+            diff[i + 1] += n_copies
+            diff[i + count + 1] -= n_copies
     return total
 
 
 def solve2(input_: Input) -> int:
-    n_copies = np.ones(len(input_), dtype=int)
-    for i, (winning, yours) in enumerate(input_):
-        winning = set(winning)
-        count = sum(num in winning for num in yours)
-        n_copies[(i + 1):(i + count + 1)] += n_copies[i]
-    return n_copies.sum()
+    return total_copies(input_.tolist())
+
+
+def solve_stream(cards: Iterable[Card]) -> tuple[int, int]:
+    # copies won for upcoming cards wait in `extra_copies`, which is never longer than the most matches on a card
+    total_score = 0
+    total_copies = 0
+    extra_copies: deque[int] = deque()
+    for card in cards:
+        n_copies = 1 + (extra_copies.popleft() if len(extra_copies) > 0 else 0)
+        count = count_matches(card)
+        total_score += score(count)
+        total_copies += n_copies
+        for i in range(count):
+            if i < len(extra_copies):
+                extra_copies[i] += n_copies
+            else:
+                extra_copies.append(n_copies)
+    return total_score, total_copies
 
 
 def main():
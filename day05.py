@@ -1,12 +1,23 @@
-import bisect
+import functools
 import re
+from functools import cached_property
 from pathlib import Path
-from pprint import pprint
-from typing import NamedTuple, Optional
+from typing import Iterator, NamedTuple
 from dataclasses import dataclass
 
+import numpy as np
+
+from advent.puzzle import Puzzle
+
 INPUT_FILE_PATH = Path("input.txt")
 
+INT64_SAFE = 1 << 62  # two numbers smaller than this can be added or subtracted without overflowing int64
+MAP_NAMES = ("seed", "soil", "fertilizer", "water", "light", "temperature", "humidity", "location")
+GENERATED_SEED_RANGES_PER_RULE = 10
+GENERATED_MAX = 1 << 32
+
+puzzle = Puzzle(__name__)
+
 
 RangeTransform = NamedTuple("RangeTransform", [
     ("start_out", int),
@@ -21,12 +32,123 @@ class Map:
     range_transforms: list[RangeTransform]
 
 
+@dataclass(frozen=True)
+class Piecewise:
+    """
+    A function that adds `offsets[j]` to every number in piece j, where the pieces are split at the sorted `breaks`:
+    piece 0 is everything below `breaks[0]`, piece j is [`breaks[j - 1]`, `breaks[j]`), and the last piece is the rest
+    """
+    breaks: np.ndarray
+    offsets: np.ndarray  # one longer than `breaks`
+
+    def __call__(self, nums: np.ndarray) -> np.ndarray:
+        return nums + self.offsets[np.searchsorted(self.breaks, nums, side="right")]
+
+
+def identity(dtype: type) -> Piecewise:
+    return Piecewise(np.zeros(0, dtype=dtype), np.zeros(1, dtype=dtype))
+
+
+def piecewise_of(map_: Map, dtype: type) -> Piecewise:
+    transforms = [r for r in map_.range_transforms if r.n > 0]
+    breaks = np.unique(np.array([[r.start_in, r.start_in + r.n] for r in transforms], dtype=dtype))
+    offsets = np.zeros(len(breaks) + 1, dtype=dtype)
+    # where ranges overlap the first one listed wins, so it's painted on last
+    for r in reversed(transforms):
+        first, last = np.searchsorted(breaks, [r.start_in, r.start_in + r.n])
+        offsets[(first + 1):(last + 1)] = r.start_out - r.start_in
+    return Piecewise(breaks, offsets)
+
+
+def compose(first: Piecewise, then: Piecewise) -> Piecewise:
+    """
+    `then` applied after `first`, as a single function.
+    Its breaks are those of `first`, and those of `then` pulled back into each piece of `first` that maps over them
+    """
+    # breaks of `then` strictly inside the image of each piece j of `first` are `then.breaks[lefts[j]:rights[j]]`
+    image_lows = first.breaks + first.offsets[1:]  # of every piece but the first
+    image_highs = first.breaks + first.offsets[:-1]  # (exclusive) of every piece but the last
+    lefts = np.concatenate([[0], np.searchsorted(then.breaks, image_lows, side="right")])
+    rights = np.concatenate([np.searchsorted(then.breaks, image_highs, side="left"), [len(then.breaks)]])
+    counts = np.maximum(rights - lefts, 0)
+    pieces = np.repeat(np.arange(len(counts)), counts)
+    ranks = np.arange(len(pieces)) - np.repeat(np.cumsum(counts) - counts, counts)  # of each pulled break in its piece
+    pulled_back = then.breaks[lefts[pieces] + ranks] - first.offsets[pieces]
+    breaks = np.sort(np.concatenate([first.breaks, pulled_back]))
+    first_offsets = first.offsets[np.searchsorted(first.breaks, breaks, side="right")]
+    then_offsets = then.offsets[np.searchsorted(then.breaks, breaks + first_offsets, side="right")]
+    offsets = np.concatenate([[first.offsets[0] + then.offsets[0]], first_offsets + then_offsets])
+    # neighboring pieces that ended up with the same offset are really one piece
+    is_break = offsets[1:] != offsets[:-1]
+    return Piecewise(breaks[is_break], np.concatenate([offsets[:1], offsets[1:][is_break]]))
+
+
+@dataclass(frozen=True)
+class IntervalSet:
+    """
+    Numbers in any of the sorted intervals [`starts[i]`, `ends[i]`), which never overlap or touch.
+    Kept in numpy arrays, of exact python ints when the bounds need more than 64 bits
+    """
+    starts: np.ndarray
+    ends: np.ndarray
+
+    @classmethod
+    def of(cls, starts: np.ndarray, ends: np.ndarray) -> "IntervalSet":
+        # sorted by start, any that overlap or touch the ones before them get merged in, in a single sweep
+        is_empty = ends <= starts
+        order = np.argsort(starts[~is_empty], kind="stable")
+        starts, ends = starts[~is_empty][order], ends[~is_empty][order]
+        if len(starts) == 0:
+            return cls(starts, ends)
+        reach = np.maximum.accumulate(ends)  # furthest end so far
+        is_new = np.concatenate([[True], starts[1:] > reach[:-1]])
+        group_lasts = np.append(np.flatnonzero(is_new)[1:] - 1, len(starts) - 1)
+        return cls(starts[is_new], reach[group_lasts])
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def map_through(self, function: Piecewise) -> "IntervalSet":
+        """
+        Every interval is split at the breaks inside it, each part is shifted by the offset of its piece,
+        and the parts are sorted and merged again; O((n + m) log(n + m)) for n intervals and m breaks
+        """
+        first = np.searchsorted(function.breaks, self.starts, side="right")  # piece of each start
+        last = np.searchsorted(function.breaks, self.ends, side="left")  # breaks inside are `first:last`
+        n_parts = last - first + 1
+        owners = np.repeat(np.arange(len(self)), n_parts)
+        ranks = np.arange(len(owners)) - np.repeat(np.cumsum(n_parts) - n_parts, n_parts)
+        pieces = first[owners] + ranks
+        # inside the interval, piece j runs from `bounds[j]` to `bounds[j + 1]`; the pads are never picked
+        pad = np.zeros(1, dtype=function.breaks.dtype)
+        bounds = np.concatenate([pad, function.breaks, pad])
+        part_starts = np.where(ranks == 0, self.starts[owners], bounds[pieces])
+        part_ends = np.where(ranks == n_parts[owners] - 1, self.ends[owners], bounds[pieces + 1])
+        shifts = function.offsets[pieces]
+        return IntervalSet.of(part_starts + shifts, part_ends + shifts)
+
+
 @dataclass
 class Input:
     seeds: list[int]
     maps: list[Map]
 
+    @cached_property
+    def dtype(self) -> type:
+        # int64 is much faster, but any bigger numbers need object arrays of python ints to stay exact
+        numbers = [*self.seeds, *(start + n for start, n in zip(self.seeds[::2], self.seeds[1::2]))]
+        for map_ in self.maps:
+            for r in map_.range_transforms:
+                numbers.extend((r.start_out, r.start_in, r.start_out + r.n, r.start_in + r.n))
+        return np.int64 if max(map(abs, numbers), default=0) < INT64_SAFE else object
+
+    @cached_property
+    def almanac(self) -> Piecewise:
+        # all the maps composed into one, from seed to location; shared by both parts
+        return functools.reduce(compose, (piecewise_of(map_, self.dtype) for map_ in self.maps), identity(self.dtype))
+
 
+@puzzle.parser
 def read_input() -> Input:
     with open(INPUT_FILE_PATH, "r", encoding="utf-8") as f:
         f_content = f.read()
@@ -45,104 +167,41 @@ def read_input() -> Input:
     return Input(seeds=seeds, maps=maps)
 
 
+@puzzle.part
 def solve1(input_: Input) -> int:
-    current_nums = set(input_.seeds)
-    for map_ in input_.maps:
-        new_nums = set()
-        for r in map_.range_transforms:
-            range_in = range(r.start_in, r.start_in + r.n)
-            shift = r.start_out - r.start_in
-            to_discard = set()
-            for num in current_nums:
-                if num in range_in:
-                    new_nums.add(num + shift)
-                    to_discard.add(num)
-            current_nums -= to_discard
-            if len(current_nums) == 0:
-                break
-        new_nums.update(current_nums)
-        current_nums = new_nums
-    return min(current_nums)
-
-
-Section = tuple[int, int]  # tuple of form (start, end) where BOTH values are INCLUSIVE
-
-
-def _simplify_sections(sections: list[Section]) -> list[Section]:
-    i = 0
-    while i + 1 < len(sections):
-        (low_start, low_end), (high_start, high_end) = sections[i:(i + 2)]
-        assert low_start <= high_start
-        if low_end + 1 >= high_start:
-            mashed_section = (min(low_start, high_start), max(low_end, high_end))
-            sections = sections[:i] + [mashed_section] + sections[(i + 2):]
-        else:
-            i += 1
-    return sections
-
-
-def _range_overlap(sec_query: Section, sec_key: Section) -> tuple[Optional[Section], list[Section]]:
-    sq_low, sq_high = sec_query
-    assert sq_low <= sq_high
-    sk_low, sk_high = sec_key
-    assert sk_low <= sk_high
-    # disjoint sections
-    if sq_high < sk_low or sk_high < sq_low:
-        return None, [sec_query]
-    # overlapping sections
-    # fudge things to avoid boundaries perfectly overlapping
-    if sq_low == sk_low:
-        sk_low -= 1
-    if sq_high == sk_high:
-        sk_high += 1
-    # figure out the actual overlap
-    if sq_low < sk_low <= sq_high < sk_high:
-        return (sk_low, sq_high), [(sq_low, sk_low - 1)]
-    elif sq_low < sk_low <= sk_high < sq_high:
-        return (sk_low, sk_high), [(sq_low, sk_low - 1), (sk_high + 1, sq_high)]
-    elif sk_low < sq_low <= sq_high < sk_high:
-        return (sq_low, sq_high), []
-    elif sk_low < sq_low <= sk_high < sq_high:
-        return (sq_low, sk_high), [(sk_high + 1, sq_high)]
-    else:
-        raise ValueError(f"{(sq_low, sq_high)=}, {(sk_low, sk_high)=}")
+    return int(input_.almanac(np.array(input_.seeds, dtype=input_.dtype)).min())
 
 
+@puzzle.part
 def solve2(input_: Input) -> int:
-    input_sections = _simplify_sections(sorted(
-        (start, start + n - 1)
-        for start, n in zip(input_.seeds[::2], input_.seeds[1::2])
-    ))
-    for map_ in input_.maps:
-        output_sections = []
-        for r in map_.range_transforms:
-            transforming_sec = (r.start_in, r.start_in + r.n - 1)
-            shift = r.start_out - r.start_in
-            i = 0
-            while i < len(input_sections):
-                input_sec = input_sections[i]
-                overlap, leftovers = _range_overlap(input_sec, transforming_sec)
-                if overlap is not None:
-                    overlap_shifted = (overlap[0] + shift, overlap[1] + shift)
-                    bisect.insort(output_sections, overlap_shifted)
-                    input_sections = input_sections[:i] + leftovers + input_sections[(i + 1):]
-                else:
-                    i += 1
-            if len(input_sections) == 0:
-                break
-        for input_sec in input_sections:  # sections that go unchanged
-            bisect.insort(output_sections, input_sec)
-        input_sections = _simplify_sections(output_sections)
-    return min(low for low, _ in input_sections)
-
-
-def main():
-    input_ = read_input()
-    answer = solve1(input_)
-    pprint(answer)
-    answer = solve2(input_)
-    pprint(answer)
+    starts = np.array(input_.seeds[::2], dtype=input_.dtype)
+    seeds = IntervalSet.of(starts, starts + np.array(input_.seeds[1::2], dtype=input_.dtype))
+    locations = seeds.map_through(input_.almanac)
+    return int(locations.starts[0])
+
+
+@puzzle.generator
+def generate(n_rules: int, rng: np.random.Generator) -> Iterator[str]:
+    """
+    `GENERATED_SEED_RANGES_PER_RULE` times as many seed ranges as rules per map.
+    Each map shuffles [0, `GENERATED_MAX`) cut into `n_rules` ranges, so every map is one-to-one, like the real ones
+    """
+    n_seed_ranges = GENERATED_SEED_RANGES_PER_RULE * n_rules
+    seed_starts = rng.integers(0, GENERATED_MAX, size=n_seed_ranges)
+    seed_lengths = rng.integers(1, max(2, GENERATED_MAX // n_seed_ranges // 4), size=n_seed_ranges)
+    yield "seeds: " + " ".join(f"{start} {n}" for start, n in zip(seed_starts.tolist(), seed_lengths.tolist()))
+    for name_in, name_out in zip(MAP_NAMES, MAP_NAMES[1:]):
+        cuts = np.sort(rng.choice(GENERATED_MAX - 1, n_rules - 1, replace=False) + 1)
+        bounds_in = np.concatenate([[0], cuts, [GENERATED_MAX]])
+        lengths = np.diff(bounds_in)
+        order_out = rng.permutation(n_rules)
+        starts_out = np.empty(n_rules, dtype=np.int64)
+        starts_out[order_out] = np.cumsum(lengths[order_out]) - lengths[order_out]
+        yield ""
+        yield f"{name_in}-to-{name_out} map:"
+        for i in rng.permutation(n_rules).tolist():
+            yield f"{starts_out[i]} {bounds_in[i]} {lengths[i]}"
 
 
 if __name__ == "__main__":
-    main()
+    puzzle.main()
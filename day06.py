@@ -1,9 +1,10 @@
 import math
 import re
-from functools import cache
 from pathlib import Path
 from pprint import pprint
 
+from advent.memo import memoize
+
 Input = list[tuple[int, int]]
 
 INPUT_FILE_PATH = Path("input.txt")
@@ -18,7 +19,7 @@ def read_input() -> Input:
     return list(zip(times, distances_to_beat))
 
 
-@cache
+@memoize(max_size=1024)
 def _evaluate_race(time_total: int, time_held: int) -> int:
     assert 0 <= time_held <= time_total
     speed = time_held
@@ -2,24 +2,23 @@ from collections import Counter, defaultdict
 from enum import Enum
 from pathlib import Path
 from pprint import pprint
-from typing import Self
+from typing import Iterable, Iterator, Self
+
+from advent.stream import iter_lines
 
 Input = list[tuple[str, int]]
 
 INPUT_FILE_PATH = Path("input.txt")
 
 
+def iter_input() -> Iterator[tuple[str, int]]:
+    for line in iter_lines(INPUT_FILE_PATH):
+        hand, bet = line.split()
+        yield hand, int(bet)
+
+
 def read_input() -> Input:
-    with open(INPUT_FILE_PATH, "r", encoding="utf-8") as f:
-        split_lines = (
-            line.split()
-            for line_ in f.readlines()
-            if (line := line_.strip()) != ""
-        )
-        return [
-            (hand, int(bet))
-            for hand, bet in split_lines
-        ]
+    return list(iter_input())
 
 
 class HandType(Enum):
@@ -94,13 +93,13 @@ class HandType(Enum):
 HAND_TYPE_ORDER = sorted(HandType, key=lambda ht: ht.value)
 
 CARD_ORDER = "23456789TJQKA"
+CARD_VALUES = {card: 1 + i for i, card in enumerate(CARD_ORDER)}
+CARD_VALUES_WITH_JOKER = {**CARD_VALUES, "J": -1}
 
 
 def card_value(card: str, *, j_is_joker: bool) -> int:
     assert len(card) == 1, "card should be a single char"
-    if j_is_joker and card == "J":
-        return -1
-    return 1 + CARD_ORDER.index(card)
+    return (CARD_VALUES_WITH_JOKER if j_is_joker else CARD_VALUES)[card]
 
 
 def hand_sorting_key(hand: str, *, j_is_joker: bool) -> list[int]:
@@ -138,6 +137,36 @@ def solve(input_: Input, *, j_is_joker: bool) -> int:
     return total_winnings
 
 
+def total_winnings_of_counts(hand_bet_counts: Counter[tuple[str, int]], *, j_is_joker: bool) -> int:
+    # same ordering as `solve`, but each distinct (hand, bet) only gets sorted once, however often it's repeated
+    get_hand_type = HandType.from_hand_with_jokers if j_is_joker else HandType.from_hand
+    overall_sorting = sorted(
+        hand_bet_counts.items(),
+        key=lambda item: (
+            get_hand_type(item[0][0]).value,
+            hand_sorting_key(item[0][0], j_is_joker=j_is_joker),
+            item[0][1],
+        ),
+    )
+    total_winnings = 0
+    n_ranked = 0
+    for (_, bet), count in overall_sorting:
+        # ranks n_ranked + 1 through n_ranked + count
+        total_winnings += bet * (count * n_ranked + count * (count + 1) // 2)
+        n_ranked += count
+    return total_winnings
+
+
+def solve_stream(hands_and_bets: Iterable[tuple[str, int]]) -> tuple[int, int]:
+    # ranking needs every hand, but there are only so many distinct hands and bets;
+    # memory grows with those rather than with the number of lines
+    hand_bet_counts = Counter(hands_and_bets)
+    return (
+        total_winnings_of_counts(hand_bet_counts, j_is_joker=False),
+        total_winnings_of_counts(hand_bet_counts, j_is_joker=True),
+    )
+
+
 def main():
     input_ = read_input()
     answer = solve(input_, j_is_joker=False)
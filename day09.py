@@ -1,61 +1,81 @@
 from pathlib import Path
-from pprint import pprint
+from typing import Iterable, Iterator
 
 import numpy as np
 
+from advent.puzzle import Puzzle
+from advent.stream import iter_lines
+
 Input = list[np.ndarray]
 
 INPUT_FILE_PATH = Path("input.txt")
 
+GENERATED_ROW_LENGTH = 21
+
+puzzle = Puzzle(__name__)
+
+
+@puzzle.stream_parser
+def iter_input() -> Iterator[np.ndarray]:
+    for line in iter_lines(INPUT_FILE_PATH):
+        yield np.array(
+            list(map(int, line.split())),
+            dtype=int,
+        )
 
+
+@puzzle.parser
 def read_input() -> Input:
-    with open(INPUT_FILE_PATH, "r", encoding="utf-8") as f:
-        return [
-            np.array(
-                list(map(int, line.strip().split())),
-                dtype=int,
-            )
-            for line in f
-        ]
+    return list(iter_input())
 
 
-def solve1(input_: Input) -> int:
-    total = 0
-    for input_row in input_:
-        row = input_row
+def extrapolate(row: np.ndarray) -> tuple[int, int]:
+    # the next value after the row, and the one before it, from a single stack of differences
+    with puzzle.span("extrapolate"):
         stack_lasts = [row[-1]]
+        stack_firsts = [row[0]]
         while not np.all(row == 0):
             row = row[1:] - row[:-1]
             stack_lasts.append(row[-1])
-        cur = 0
+            stack_firsts.append(row[0])
+        next_ = 0
         for row_last in reversed(stack_lasts):
-            cur += row_last
-        total += cur
-    return total
+            next_ += row_last
+        prev = 0
+        for row_first in reversed(stack_firsts):
+            prev = row_first - prev
+        return int(next_), int(prev)
 
 
+@puzzle.part
+def solve1(input_: Input) -> int:
+    return sum(extrapolate(row)[0] for row in input_)
+
+
+@puzzle.part
 def solve2(input_: Input) -> int:
-    total = 0
-    for input_row in input_:
-        row_first = input_row
-        stack_firsts = [row_first[0]]
-        while not np.all(row_first == 0):
-            row_first = row_first[1:] - row_first[:-1]
-            stack_firsts.append(row_first[0])
-        cur = 0
-        for row_first in reversed(stack_firsts):
-            cur = row_first - cur
-        total += cur
-    return total
+    return sum(extrapolate(row)[1] for row in input_)
+
+
+@puzzle.stream_solver
+def solve_stream(rows: Iterable[np.ndarray]) -> tuple[int, int]:
+    total1 = 0
+    total2 = 0
+    for row in rows:
+        next_, prev = extrapolate(row)
+        total1 += next_
+        total2 += prev
+    return total1, total2
 
 
-def main():
-    input_ = read_input()
-    answer = solve1(input_)
-    pprint(answer)
-    answer = solve2(input_)
-    pprint(answer)
+@puzzle.generator
+def generate(n_lines: int, rng: np.random.Generator) -> Iterator[str]:
+    # polynomials of degree 5 or less, so the differences always bottom out in zeros
+    x = np.arange(GENERATED_ROW_LENGTH)
+    for _ in range(n_lines):
+        coefficients = rng.integers(-5, 6, size=rng.integers(1, 7))
+        yield " ".join(map(str, np.polyval(coefficients, x)))
 
 
 if __name__ == "__main__":
-    main()
+    puzzle.main()
@@ -5,22 +5,24 @@ from typing import Iterable, Self
 
 import numpy as np
 
+from advent.grid import ByteGrid, load_byte_grid
+
 Loc = tuple[int, int]
-PipeGrid = np.ndarray  # 2-dimensional array of single-char strings
+PipeGrid = ByteGrid
 
-START = "S"
-EMPTY = "."
+# ascii codes, to match the byte grid
+START = ord("S")
+EMPTY = ord(".")
 
 INPUT_FILE_PATH = Path("input.txt")
 
 
 def _find_start(grid: PipeGrid) -> Loc:
-    for r, row in enumerate(grid):
-        for c, char in enumerate(row):
-            if char == START:
-                return r, c
-    else:
+    locs = np.argwhere(grid == START)
+    if len(locs) == 0:
         raise ValueError("start location not found")
+    r, c = locs[0]
+    return int(r), int(c)
 
 
 class Direction(Enum):
@@ -48,12 +50,12 @@ def shift(loc: Loc, direction: Direction) -> Loc:
 
 
 class Pipe(Enum):
-    UL = "J"
-    UR = "L"
-    UD = "|"
-    LR = "-"
-    LD = "7"
-    RD = "F"
+    UL = ord("J")
+    UR = ord("L")
+    UD = ord("|")
+    LR = ord("-")
+    LD = ord("7")
+    RD = ord("F")
 
     def to_directions(self) -> tuple[Direction, Direction]:
         dict_ = {
@@ -83,12 +85,8 @@ class Pipe(Enum):
 
 def read_input() -> tuple[PipeGrid, Loc]:
     # read raw input
-    with open(INPUT_FILE_PATH, "r", encoding="utf-8") as f:
-        grid = np.array([
-            list(line.strip())
-            for line in f
-        ])
-    # pad for convenience
+    grid = load_byte_grid(INPUT_FILE_PATH)
+    # pad for convenience (also makes a writable copy)
     grid = np.pad(grid, 1, constant_values=EMPTY)
     # find the start symbol and figure out what kind of pipe it is
     start_loc = _find_start(grid)
@@ -142,13 +140,9 @@ def solve2(grid: PipeGrid, loop_locs: set[Loc]) -> int:
         for r in range(grid.shape[0])
     ])
     is_inside = np.zeros(grid.shape[1], dtype=bool)
+    crossing_pipes = [Pipe.UL.value, Pipe.LR.value, Pipe.LD.value]
     for row, is_loop_row in zip(grid, is_loop):
-        could_be_crossing = np.array([
-            Pipe(symbol) in (Pipe.UL, Pipe.LR, Pipe.LD)
-                if symbol != EMPTY
-                else False
-            for symbol in row
-        ])
+        could_be_crossing = np.isin(row, crossing_pipes)
         is_crossing = np.logical_and(could_be_crossing, is_loop_row)
         is_inside = np.where(is_crossing, np.logical_not(is_inside), is_inside)
         is_inside_fully = np.logical_and(is_inside, np.logical_not(is_loop_row))
@@ -1,8 +1,9 @@
 import re
-from functools import cache
 from pathlib import Path
 from pprint import pprint
 
+from advent.memo import memoize
+
 Input = list[tuple[str, tuple[int, ...]]]
 
 INPUT_FILE_PATH = Path("input.txt")
@@ -23,7 +24,7 @@ def read_input() -> Input:
         return to_return
 
 
-@cache
+@memoize(max_size=1024)
 def get_regex(numbers: tuple[int, ...]):
     pattern_bookend = "[.?]*"
     pattern_joined_blocks = "[.?]+".join("[#?]{" + str(num) + "}" for num in numbers)
@@ -31,7 +32,7 @@ def get_regex(numbers: tuple[int, ...]):
     return re_springs
 
 
-@cache
+@memoize(max_bytes=64 << 20)  # keys are strings that can be long once expanded
 def _count_matches_brute(spring_states: str, numbers: tuple[int, ...]) -> int:
     # trim any deterministic prefix
     while len(numbers) > 0:
@@ -3,22 +3,20 @@ from pprint import pprint
 
 import numpy as np
 
-Input = np.ndarray  # each slot is a single char
+from advent.grid import ByteGrid, load_byte_grid
+
+Input = ByteGrid
 
 INPUT_FILE_PATH = Path("input.txt")
 
-EMPTY = "."
-ROCK_STATIC = "#"
-ROCK_MOBILE = "O"
+# ascii codes, to match the byte grid
+EMPTY = ord(".")
+ROCK_STATIC = ord("#")
+ROCK_MOBILE = ord("O")
 
 
 def read_input() -> Input:
-    with open(INPUT_FILE_PATH, "r", encoding="utf-8") as f:
-        return np.array([
-            list(line)
-            for line_ in f
-            if (line := line_.strip()) != ""
-        ])
+    return load_byte_grid(INPUT_FILE_PATH)
 
 
 def tilt_north(grid: np.ndarray) -> np.ndarray:
@@ -38,7 +36,7 @@ def tilt_north(grid: np.ndarray) -> np.ndarray:
                 grid[r_destination, c] = ROCK_MOBILE
                 r_last_obstacle = r_destination
             else:
-                raise ValueError(f"grid[{r}, {c}] has unexpected value {obj!r}")
+                raise ValueError(f"grid[{r}, {c}] has unexpected value {chr(obj)!r}")
     return grid
 
 
@@ -63,11 +61,11 @@ def solve2(grid: Input, *, n_cycles: int) -> int:
             grid = np.rot90(grid, k=-1)
             if has_skipped:
                 continue  # don't bother checking or updating anything for cycle detection
-            grid_str = "\n".join("".join(row) for row in grid)
+            grid_bytes = grid.tobytes()  # every grid of the same rotation has the same shape
             seen_states = seen_states_by_rotation[rot]
-            last_seen = seen_states.get(grid_str)
+            last_seen = seen_states.get(grid_bytes)
             if last_seen is None:
-                seen_states[grid_str] = i_cycle
+                seen_states[grid_bytes] = i_cycle
             else:  # seen it before
                 period = i_cycle - last_seen
                 # print(f"cycle {i_cycle} rotation {rot} was equivalent to the same rotation of cycle {last_seen}")
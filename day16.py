@@ -1,90 +1,96 @@
-from collections import defaultdict
 from enum import Enum
 from pathlib import Path
 from pprint import pprint
 from typing import Iterable
 
-import numpy as np
+from advent.grid import DIRECTION_DELTAS, DIRECTIONS, DOWN, LEFT, RIGHT, UP, ByteGrid, FlatGrid, load_byte_grid
 
-
-class Direction(Enum):
-    UP = (-1, 0)
-    LEFT = (0, -1)
-    DOWN = (1, 0)
-    RIGHT = (0, 1)
+OFF_GRID = 0  # padding around the grid; not the ascii code of any mirror
 
 
 class Mirror(Enum):
-    EMPTY = "."
-    NW = "\\"
-    NE = "/"
-    VERT = "|"
-    HORIZ = "-"
-
-    def reflect(self, direction: Direction) -> set[Direction]:
-        direction_tup = direction.value
+    EMPTY = ord(".")
+    NW = ord("\\")
+    NE = ord("/")
+    VERT = ord("|")
+    HORIZ = ord("-")
+
+    def reflect(self, direction: int) -> tuple[int, ...]:
+        d_row, d_col = DIRECTION_DELTAS[direction]
         if self == self.EMPTY:
-            return {direction}  # no change
+            return (direction,)  # no change
         elif self == self.NW:
-            return {Direction((direction_tup[1], direction_tup[0]))}
+            return (DIRECTION_DELTAS.index((d_col, d_row)),)
         elif self == self.NE:
-            return {Direction((-1 * direction_tup[1], -1 * direction_tup[0]))}
+            return (DIRECTION_DELTAS.index((-1 * d_col, -1 * d_row)),)
         elif self == self.VERT:
-            split_dirs = {Direction.UP, Direction.DOWN}
+            split_dirs = (UP, DOWN)
         elif self == self.HORIZ:
-            split_dirs = {Direction.LEFT, Direction.RIGHT}
+            split_dirs = (LEFT, RIGHT)
         else:
             raise ValueError(f"unrecognized direction: {direction}")
         if direction in split_dirs:
-            return {direction}  # no change
+            return (direction,)  # no change
         else:
             return split_dirs
 
 
-Input = np.ndarray
+# outgoing directions, indexed by the ascii code of a mirror and then by the incoming direction
+REFLECTIONS: list[tuple[tuple[int, ...], ...] | None] = [None] * 256
+for _mirror in Mirror:
+    REFLECTIONS[_mirror.value] = tuple(_mirror.reflect(direction) for direction in DIRECTIONS)
+
+
+Input = ByteGrid
 
 INPUT_FILE_PATH = Path("input.txt")
 
 
 def read_input() -> Input:
-    with open(INPUT_FILE_PATH, "r", encoding="utf-8") as f:
-        return np.array([
-            [Mirror(sym) for sym in line.strip()]
-            for line in f
-        ])
-
-
-def solve1(grid: Input, *, start_loc: tuple[int, int] = (0, 0), start_direction: Direction = Direction.RIGHT) -> int:
-    energized_locs_with_dirs = defaultdict(set)
-    energized_locs_with_dirs[start_loc].add(start_direction)
-    search_queue = {(start_loc, start_direction)}
-    while len(search_queue) > 0:
-        loc, direction = search_queue.pop()
-        mirror = grid[loc]
-        for new_direction in mirror.reflect(direction):
-            new_loc: tuple[int, int] = tuple(d + shift for d, shift in zip(loc, new_direction.value))
-            if any(not (0 <= d < limit) for d, limit in zip(new_loc, grid.shape)):
-                continue  # off-grid
-            if new_direction in energized_locs_with_dirs[new_loc]:
+    return load_byte_grid(INPUT_FILE_PATH)
+
+
+def count_energized(grid: FlatGrid, start_index: int, start_direction: int) -> int:
+    cells, steps = grid.cells, grid.steps
+    # which directions each cell has been entered from, as a bitmask
+    energized_dirs = bytearray(len(cells))
+    energized_dirs[start_index] = 1 << start_direction
+    # states are packed into single ints: index * 4 + direction
+    search_stack = [start_index << 2 | start_direction]
+    while len(search_stack) > 0:
+        state = search_stack.pop()
+        index = state >> 2
+        for new_direction in REFLECTIONS[cells[index]][state & 3]:
+            new_index = index + steps[new_direction]
+            if cells[new_index] == OFF_GRID:
+                continue
+            bit = 1 << new_direction
+            if energized_dirs[new_index] & bit:
                 continue  # in a cycle
-            # mark it as energized and make sure we add it to the queue for further expansion
-            energized_locs_with_dirs[new_loc].add(new_direction)
-            search_queue.add((new_loc, new_direction))
-    return sum(len(dirs) > 0 for dirs in energized_locs_with_dirs.values())
+            # mark it as energized and make sure we add it to the stack for further expansion
+            energized_dirs[new_index] |= bit
+            search_stack.append(new_index << 2 | new_direction)
+    return len(energized_dirs) - energized_dirs.count(0)
+
+
+def solve1(grid: Input, *, start_loc: tuple[int, int] = (0, 0), start_direction: int = RIGHT) -> int:
+    flat = FlatGrid(grid, pad=OFF_GRID)
+    return count_energized(flat, flat.index(start_loc), start_direction)
 
 
 def solve2(grid: Input) -> int:
     n_rows, n_cols = grid.shape
     last_row, last_col = n_rows - 1, n_cols - 1
-    def gen_entrypoints() -> Iterable[tuple[tuple[int, int], Direction]]:
+    flat = FlatGrid(grid, pad=OFF_GRID)
+    def gen_entrypoints() -> Iterable[tuple[tuple[int, int], int]]:
         for row in range(n_rows):
-            yield (row, 0), Direction.RIGHT
-            yield (row, last_col), Direction.LEFT
+            yield (row, 0), RIGHT
+            yield (row, last_col), LEFT
         for col in range(n_cols):
-            yield (0, col), Direction.DOWN
-            yield (last_row, col), Direction.UP
+            yield (0, col), DOWN
+            yield (last_row, col), UP
     return max(
-        solve1(grid, start_loc=start_loc, start_direction=start_direction)
+        count_energized(flat, flat.index(start_loc), start_direction)
         for start_loc, start_direction in gen_entrypoints()
     )
 
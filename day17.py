@@ -1,12 +1,11 @@
-import heapq
-from enum import Enum
-from functools import cache
 from pathlib import Path
 from pprint import pprint
-from typing import Any, Callable, Generic, Iterable, NamedTuple, TypeVar
 
 import numpy as np
 
+from advent.grid import DIRECTIONS, DOWN, OPPOSITE, RIGHT, FlatGrid
+from advent.priority_queue import PriorityQueue
+
 INPUT_FILE_PATH = Path("input.txt")
 
 MAX_GRID_VAL = 9
@@ -14,6 +13,13 @@ N_STRAIGHT_LIMIT = 3
 ULTRA_N_STRAIGHT_MIN = 4
 ULTRA_N_STRAIGHT_LIMIT = 10
 
+OFF_GRID = -1  # padding around the grid
+# states are packed into single ints: the flat index of the cell, then the direction it was entered in,
+# then how many steps in a row have gone that way
+N_STRAIGHT_BITS = 4
+N_STRAIGHT_MASK = (1 << N_STRAIGHT_BITS) - 1
+INDEX_SHIFT = N_STRAIGHT_BITS + 2
+
 
 def read_input() -> np.ndarray:
     with open(INPUT_FILE_PATH, "r", encoding="utf-8") as f:
@@ -23,184 +29,133 @@ def read_input() -> np.ndarray:
         ])
 
 
-class Direction(Enum):
-    UP = (-1, 0)
-    LEFT = (0, -1)
-    DOWN = (1, 0)
-    RIGHT = (0, 1)
-
-    def opposite(self) -> "Direction":
-        return type(self)(tuple(-1 * d for d in self.value))
-
-    def next_direcion_options(self, n_straight: int, *, ultra: bool) -> set["Direction"]:
-        if ultra:
-            if n_straight < ULTRA_N_STRAIGHT_MIN:
-                return {self}
-            n_straight_max = ULTRA_N_STRAIGHT_LIMIT
-        else:
-            n_straight_max = N_STRAIGHT_LIMIT
-        options = set(type(self))  # all directions
-        options.discard(self.opposite())  # no u-turns
-        if n_straight >= n_straight_max:
-            options.discard(self)  # can't keep going the same direction
-        return options
-
-    def shift(self, loc: tuple[int, int]) -> tuple[int, int]:
-        return tuple(d + shift for d, shift in zip(loc, self.value))
-
-
-class State(NamedTuple):
-    loc: tuple[int, int]
-    prev_direction: Direction
-    n_straight: int
-    total_so_far: int
-
-    def dict_key(self):
-        return self.loc, self.prev_direction, self.n_straight
-
-
-Key = int
-
-
-T = TypeVar("T")
-
-
-class PriorityQueue(Generic[T]):
-    def __init__(self, key: Callable[[T], Key]):
-        class _Elem:
-            def __init__(self, value: T):
-                self.value = value
-
-            def __repr__(self) -> str:
-                return f"{self.__class__.__name__}({self.value!r})"
-
-            def __lt__(self, other: Any) -> bool:
-                if not isinstance(other, type(self)):
-                    return self < other
-                return key(self.value) < key(other.value)
-        self._Elem = _Elem
-        self.data: list[self._Elem] = []
-
-    def __len__(self) -> int:
-        return len(self.data)
+def next_direction_options(direction: int, n_straight: int, *, ultra: bool) -> tuple[int, ...]:
+    if ultra:
+        if n_straight < ULTRA_N_STRAIGHT_MIN:
+            return (direction,)
+        n_straight_max = ULTRA_N_STRAIGHT_LIMIT
+    else:
+        n_straight_max = N_STRAIGHT_LIMIT
+    return tuple(
+        option
+        for option in DIRECTIONS
+        if option != OPPOSITE[direction]  # no u-turns
+        and not (option == direction and n_straight >= n_straight_max)  # can't keep going the same direction
+    )
+
+
+# indexed by `ultra`, then by the previous direction, then by how many steps in a row went that way
+NEXT_DIRECTIONS = tuple(
+    tuple(
+        tuple(
+            next_direction_options(direction, n_straight, ultra=ultra)
+            for n_straight in range(ULTRA_N_STRAIGHT_LIMIT + 1)
+        )
+        for direction in DIRECTIONS
+    )
+    for ultra in (False, True)
+)
 
-    def heappush(self, value: T):
-        heapq.heappush(self.data, self._Elem(value))
 
-    def heappop(self) -> T:
-        elem = heapq.heappop(self.data)
-        return elem.value
+def pack_state(index: int, direction: int, n_straight: int) -> int:
+    return (index << 2 | direction) << N_STRAIGHT_BITS | n_straight
 
 
 class Solver:
     def __init__(self, grid: np.ndarray) -> None:
         if len(grid.shape) != 2:
             raise ValueError("only ready to handle 2D grids")
-        self.grid = grid
-        self.target = (grid.shape[0] - 1, grid.shape[1] - 1)
-
-    def step(self, state: State, direction: Direction) -> State:
-        new_loc = direction.shift(state.loc)
-        n_straight = state.n_straight + 1 if direction == state.prev_direction else 1
-        total_so_far = state.total_so_far + self.grid[new_loc]
-        return State(
-            loc=new_loc,
-            prev_direction=direction,
-            n_straight=n_straight,
-            total_so_far=total_so_far,
-        )
-
-    def gen_possible_steps(self, state: State, *, ultra: bool) -> Iterable[State]:
-        for next_direction in state.prev_direction.next_direcion_options(state.n_straight, ultra=ultra):
-            try:
-                new_state = self.step(state, next_direction)
-                if not all(0 <= d < limit for d, limit in zip(new_state.loc, self.grid.shape)):
-                    raise IndexError("out of bounds (sneaky)")
-            except IndexError:
-                continue  # stay in-bounds
-            else:
-                yield new_state
-
-    @cache
-    def manhattan(self, loc: tuple[int, int]) -> int:
-        return sum(abs(d_dest - d) for d, d_dest in zip(loc, self.target))
-
-    @cache
-    def loc_score(self, loc: tuple[int, int]) -> int:
-        manhattan = self.manhattan(loc)
-        offset_penalty = abs(loc[0] - loc[1])
-        score = manhattan + offset_penalty
-        return score
-
-    def step_greedy(self, state: State, *, ultra: bool) -> State | None:
-        best_new_state = None
-        best_score = None
-        for new_state in self.gen_possible_steps(state, ultra=ultra):
-            this_score = self.loc_score(new_state.loc)
-            if best_score is None or this_score < best_score:
-                best_score = this_score
-                best_new_state = new_state
-        return best_new_state
-
-    def solve_greedy(self, state: State, *, ultra: bool) -> int | None:
+        self.grid = FlatGrid(grid, pad=OFF_GRID)
+        target_row, target_col = grid.shape[0] - 1, grid.shape[1] - 1
+        self.max_total = (target_row + target_col) * MAX_GRID_VAL
+        self.target = self.grid.index((target_row, target_col))
+        # per-cell scores, indexed like the flat grid
+        rows = np.arange(-1, grid.shape[0] + 1)[:, np.newaxis]
+        cols = np.arange(-1, grid.shape[1] + 1)[np.newaxis, :]
+        manhattan = np.abs(target_row - rows) + np.abs(target_col - cols)
+        self.manhattan: list[int] = manhattan.ravel().tolist()
+        offset_penalty = np.abs(rows - cols)
+        self.loc_score: list[int] = (manhattan + offset_penalty).ravel().tolist()
+
+    def solve_greedy(
+            self,
+            index: int,
+            direction: int,
+            n_straight: int,
+            total_so_far: int,
+            *,
+            ultra: bool,
+    ) -> int | None:
+        cells, steps = self.grid.cells, self.grid.steps
+        next_directions = NEXT_DIRECTIONS[ultra]
         seen = set()
-        while state.loc != self.target:
-            state = self.step_greedy(state, ultra=ultra)
-            if state is None:
+        while index != self.target:
+            best_step = None
+            best_score = None
+            for next_direction in next_directions[direction][n_straight]:
+                next_index = index + steps[next_direction]
+                if cells[next_index] == OFF_GRID:
+                    continue  # stay in-bounds
+                this_score = self.loc_score[next_index]
+                if best_score is None or this_score < best_score:
+                    best_score = this_score
+                    best_step = next_direction, next_index
+            if best_step is None:
                 return None
+            next_direction, index = best_step
+            n_straight = n_straight + 1 if next_direction == direction else 1
+            direction = next_direction
+            total_so_far += cells[index]
             # watch for repeated movements
-            key = state.dict_key()
-            if key in seen:
+            state_key = pack_state(index, direction, n_straight)
+            if state_key in seen:
                 raise ValueError("infinite loop in greedy algorithm")
-            seen.add(key)
-        return state.total_so_far
-
-    @cache
-    def lower_bound(self, state: State) -> int:
-        manhattan = self.manhattan(state.loc)
-        bound = state.total_so_far + manhattan
-        return bound
-
-    def key(self, state: State) -> Key:
-        return state.total_so_far
+            seen.add(state_key)
+        return total_so_far
 
     def solve(self, *, ultra: bool = False) -> int:
-        best = sum(self.target) * MAX_GRID_VAL
-        p_queue = PriorityQueue(key=self.key)
-        dijk: dict[tuple, int] = {}
-        for direction in (Direction.RIGHT, Direction.DOWN):
-            loc = direction.shift((0, 0))
-            state = State(
-                loc=loc,
-                prev_direction=direction,
-                n_straight=1,
-                total_so_far=self.grid[loc],
-            )  # technically should check if this has reached the target...
-            dijk[state.dict_key()] = state.total_so_far
-            upper_bound = self.solve_greedy(state, ultra=ultra)
-            if upper_bound is not None and (best is None or upper_bound < best):
+        cells, steps, manhattan = self.grid.cells, self.grid.steps, self.manhattan
+        next_directions = NEXT_DIRECTIONS[ultra]
+        n_straight_min = ULTRA_N_STRAIGHT_MIN if ultra else 1
+        best = self.max_total
+        p_queue: PriorityQueue[int, int] = PriorityQueue()
+        dijk: dict[int, int] = {}
+        start = self.grid.index((0, 0))
+        for direction in (RIGHT, DOWN):
+            index = start + steps[direction]
+            total_so_far = cells[index]  # technically should check if this has reached the target...
+            state_key = pack_state(index, direction, 1)
+            dijk[state_key] = total_so_far
+            upper_bound = self.solve_greedy(index, direction, 1, total_so_far, ultra=ultra)
+            if upper_bound is not None and upper_bound < best:
                 best = upper_bound
-            p_queue.heappush(state)
+            p_queue.push(state_key, total_so_far)
         while len(p_queue) > 0:
-            state = p_queue.heappop()
-            if state.total_so_far > dijk.get(state.dict_key(), float("inf")) \
-                    or self.lower_bound(state) >= best:
+            total_so_far, state_key = p_queue.pop_with_priority()
+            index = state_key >> INDEX_SHIFT
+            if total_so_far + manhattan[index] >= best:
                 continue
-            for next_state in self.gen_possible_steps(state, ultra=ultra):
-                state_key = next_state.dict_key()
-                if next_state.total_so_far >= dijk.get(state_key, float("inf")):
+            direction = state_key >> N_STRAIGHT_BITS & 3
+            n_straight = state_key & N_STRAIGHT_MASK
+            for next_direction in next_directions[direction][n_straight]:
+                next_index = index + steps[next_direction]
+                cost = cells[next_index]
+                if cost == OFF_GRID:
+                    continue  # stay in-bounds
+                next_n_straight = n_straight + 1 if next_direction == direction else 1
+                next_total = total_so_far + cost
+                next_key = pack_state(next_index, next_direction, next_n_straight)
+                if next_total >= dijk.get(next_key, next_total + 1):
                     continue  # something else has been here already, but this proposed path is no better
-                dijk[state_key] = next_state.total_so_far
-                lower_bound = self.lower_bound(next_state)
-                if next_state.loc == self.target and (
-                    not ultra or (ultra and next_state.n_straight >= ULTRA_N_STRAIGHT_MIN)
-                ):  # found a way to get to the target
-                    # lower_bound is its actual score too
+                dijk[next_key] = next_total
+                lower_bound = next_total + manhattan[next_index]
+                if next_index == self.target and next_n_straight >= n_straight_min:
+                    # found a way to get to the target; lower_bound is its actual score too
                     best = min(best, lower_bound)
                     continue
                 if lower_bound >= best:
                     continue
-                p_queue.heappush(next_state)
+                p_queue.push(next_key, next_total)  # decreases the key if already queued
         return best
 
 
@@ -1,3 +1,6 @@
+from __future__ import annotations  # keeps `torch.Tensor` hints from importing torch
+
+import functools
 import itertools
 from pprint import pprint
 import random
@@ -6,9 +9,15 @@ from abc import ABC
 from collections import Counter, deque
 from pathlib import Path
 
-import torch
+from advent.lazy import lazy_import
+
+torch = lazy_import("torch")
+
+
+@functools.cache
+def _get_device() -> torch.device:
+    return torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
-_device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
 INPUT_FILE_PATH = Path("input.txt")
 
@@ -115,9 +124,10 @@ class ModuleSystem:
         index_to_name = [BROADCASTER] + sorted(all_names) + [MAGIC_MACHINE]
         name_to_index = {name: i for i, name in enumerate(index_to_name)}
         n = len(name_to_index)
+        device = _get_device()
         # module type masks / vectors
-        is_flipflop = torch.zeros(n, dtype=torch.int8, device=_device)
-        is_conjunction = torch.zeros(n, dtype=torch.int8, device=_device)
+        is_flipflop = torch.zeros(n, dtype=torch.int8, device=device)
+        is_conjunction = torch.zeros(n, dtype=torch.int8, device=device)
         for name, module in input_.items():
             i = name_to_index[name]
             if isinstance(module, FlipFlopModule):
@@ -128,7 +138,7 @@ class ModuleSystem:
         adjacency = torch.zeros(
             (n, n),
             dtype=torch.int8,
-            device=_device,
+            device=device,
         )
         for name, module in input_.items():
             i = name_to_index[name]
@@ -139,7 +149,7 @@ class ModuleSystem:
         state = torch.ones(  # ConjunctionModule memory for non-inputs is "high" so checking if all are high can work without a mask
             (n, n),
             dtype=torch.int8,
-            device=_device,
+            device=device,
         )
         for name, module in input_.items():
             i = name_to_index[name]
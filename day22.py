@@ -1,11 +1,12 @@
 import copy
 import functools
-import heapq
 from collections import defaultdict
 import itertools
 from pathlib import Path
 from pprint import pprint
-from typing import Any, Callable, Generic, Iterable, Sequence, TypeVar
+from typing import Iterable, Sequence, TypeVar
+
+from advent.priority_queue import PriorityQueue
 
 INPUT_FILE_PATH = Path("input.txt")
 
@@ -116,36 +117,6 @@ def solve(blocks: Input) -> int:
     yield n_to_fall
 
 
-Key = TypeVar("Key")
-
-
-class PriorityQueue(Generic[T, Key]):
-    def __init__(self, key: Callable[[T], Key]):
-        class _Elem:
-            def __init__(self, value: T):
-                self.value = value
-
-            def __repr__(self) -> str:
-                return f"{self.__class__.__name__}({self.value!r})"
-
-            def __lt__(self, other: Any) -> bool:
-                if not isinstance(other, type(self)):
-                    return self < other
-                return key(self.value) < key(other.value)
-        self._Elem = _Elem
-        self.data: list[self._Elem] = []
-
-    def __len__(self) -> int:
-        return len(self.data)
-
-    def heappush(self, value: T):
-        heapq.heappush(self.data, self._Elem(value))
-
-    def heappop(self) -> T:
-        elem = heapq.heappop(self.data)
-        return elem.value
-
-
 def solve2(
         block_num_del: int,
         block_del: Block,
@@ -164,11 +135,11 @@ def solve2(
     for x, y in gen_xy_points(block_del):
         if (block_num_above := point_to_block_num.get((x, y, z_max + 1))) is not None:
             if block_num_above not in queue_blacklist:
-                p_queue.heappush(block_num_above)
+                p_queue.push(block_num_above)
                 queue_blacklist.add(block_num_above)
     count = 0
     while len(p_queue) > 0:
-        block_num = p_queue.heappop()
+        block_num = p_queue.pop()
         block = blocks[block_num]
         # list any blocks above the current one
         z_max = max_on_dim(block, dim=-1)
@@ -212,7 +183,7 @@ def solve2(
             # add ones above it to queue
             for block_num_above in block_nums_above:
                 if block_num_above not in queue_blacklist:
-                    p_queue.heappush(block_num_above)
+                    p_queue.push(block_num_above)
                     queue_blacklist.add(block_num_above)
     return count
 
@@ -1,62 +1,44 @@
 from pathlib import Path
 from pprint import pprint
 import numpy as np
-from enum import Enum
 
-Input = np.ndarray
+from advent.grid import DIRECTIONS, DOWN, LEFT, OPPOSITE, RIGHT, UP, ByteGrid, FlatGrid, load_byte_grid
+
+Input = ByteGrid
 Loc = tuple[int, int]
 
 INPUT_FILE_PATH = Path("input.txt")
 
-TREE = "#"
-PATH = "."
+# ascii codes, to match the byte grid
+TREE = ord("#")
+PATH = ord(".")
 
 
 def read_input() -> Input:
-    with open(INPUT_FILE_PATH, "r", encoding="utf-8") as f:
-        return np.array([
-            [c for c in line.strip()]
-            for line in f
-        ])
-
-
-class Direction(Enum):
-    RIGHT = (0, 1)
-    DOWN = (1, 0)
-    LEFT = (0, -1)
-    UP = (-1, 0)
-
-    def opposite(self) -> "Direction":
-        return self.__class__(tuple(-1 * d for d in self.value))
-
-    def shift(self, loc: Loc) -> Loc:
-        new_loc = tuple(d + s for d, s in zip(loc, self.value))
-        return new_loc
+    return load_byte_grid(INPUT_FILE_PATH)
 
 
 ICE_TO_DIRECTION = {
-    ">": Direction.RIGHT,
-    "v": Direction.DOWN,
-    "<": Direction.LEFT,
-    "^": Direction.UP,
+    ord(">"): RIGHT,
+    ord("v"): DOWN,
+    ord("<"): LEFT,
+    ord("^"): UP,
 }
+# the same, but indexed by ascii code; -1 where there's no ice
+ICE_DIRECTIONS = [ICE_TO_DIRECTION.get(sym, -1) for sym in range(256)]
 
 
 def find_junctions(grid: np.ndarray) -> set[Loc]:
-    _junctions = set()
-    for r, row in enumerate(grid[1:-1], start=1):
-        for c, sym in enumerate(row[1:-1], start=1):
-            if sym != PATH:
-                continue
-            loc = (r, c)
-            open_neighbors = set()
-            for direction in Direction:
-                neighbor = direction.shift(loc)
-                if grid[neighbor] != TREE:
-                    open_neighbors.add(neighbor)
-            if len(open_neighbors) != 2:
-                _junctions.add(loc)
-    return _junctions
+    inner = grid[1:-1, 1:-1]
+    is_open = grid != TREE
+    n_open_neighbors = (
+        is_open[:-2, 1:-1].astype(int)
+        + is_open[2:, 1:-1]
+        + is_open[1:-1, :-2]
+        + is_open[1:-1, 2:]
+    )
+    rows, cols = np.nonzero((inner == PATH) & (n_open_neighbors != 2))
+    return {(int(r) + 1, int(c) + 1) for r, c in zip(rows, cols)}
 
 
 class Solver:
@@ -64,14 +46,12 @@ class Solver:
         self.ignore_ice = ignore_ice
         if self.ignore_ice:
             grid = grid.copy()
-            for r, row in enumerate(grid):
-                for c, sym in enumerate(row):
-                    if sym in ICE_TO_DIRECTION:
-                        grid[r, c] = PATH
-        self.grid = grid
+            grid[np.isin(grid, list(ICE_TO_DIRECTION))] = PATH
+        # the border of trees keeps every step from the start and end locs on the grid
+        self.grid = FlatGrid(grid, pad=TREE)
         # find start loc
         start_row = 0
-        for col, sym in enumerate(self.grid[start_row]):
+        for col, sym in enumerate(grid[start_row]):
             if sym != TREE:
                 start_col = col
                 break
@@ -79,8 +59,8 @@ class Solver:
             raise ValueError("start loc not found")
         self.start_loc = (start_row, start_col)
         # find end loc
-        end_row = self.grid.shape[0] - 1
-        for col, sym in enumerate(self.grid[end_row]):
+        end_row = grid.shape[0] - 1
+        for col, sym in enumerate(grid[end_row]):
             if sym != TREE:
                 end_col = col
                 break
@@ -88,27 +68,30 @@ class Solver:
             raise ValueError("end loc not found")
         self.end_loc = (end_row, end_col)
         # find junctions
-        _junctions = find_junctions(self.grid)
+        _junctions = find_junctions(grid)
         self.index_to_junction = [self.start_loc] + sorted(_junctions) + [self.end_loc]
-        self.junction_to_index = {junction: i for i, junction in enumerate(self.index_to_junction)}
+        # keyed by flat index in the grid
+        self.junction_to_index = {self.grid.index(junction): i for i, junction in enumerate(self.index_to_junction)}
         self.n = len(self.junction_to_index)
-
-    def _trailblaze(self, loc: Loc, seen: set[Loc]) -> tuple[Loc, int] | None:
-        steps = 1
-        while loc not in self.junction_to_index:
-            seen.add(loc)
-            sym = self.grid[loc]
-            if (ice_direction := ICE_TO_DIRECTION.get(sym)) is not None:
+        self.end_index = self.junction_to_index[self.grid.index(self.end_loc)]
+
+    def _trailblaze(self, cell: int, seen: set[int]) -> tuple[int, int] | None:
+        cells, steps = self.grid.cells, self.grid.steps
+        steps_taken = 1
+        while cell not in self.junction_to_index:
+            seen.add(cell)
+            ice_direction = ICE_DIRECTIONS[cells[cell]]
+            if ice_direction >= 0:
                 # currently on ice; forced to move in the direction it points
-                next_loc = ice_direction.shift(loc)
+                next_cell = cell + steps[ice_direction]
             else:  # currently on path; find the one direction available to move
-                for direction in Direction:
-                    next_loc = direction.shift(loc)
-                    if next_loc not in seen:
-                        sym = self.grid[next_loc]
+                for direction in DIRECTIONS:
+                    next_cell = cell + steps[direction]
+                    if next_cell not in seen:
+                        sym = cells[next_cell]
                         if sym == TREE:
                             continue
-                        if ICE_TO_DIRECTION.get(sym) == direction.opposite():
+                        if ICE_DIRECTIONS[sym] == OPPOSITE[direction]:
                             continue  # can't go onto ice that would push us right back
                         # can indeed step here
                         break
@@ -116,18 +99,25 @@ class Solver:
                     # no new junction to record a connection to
                     return None
             # do step in the available direction
-            steps += 1
-            loc = next_loc
-        return loc, steps
-
-    def dfs_longest(self, adjacency: np.ndarray, cur_index: int, cur_dist: int, visited: set[int]) -> int | None:
-        if cur_index == self.junction_to_index[self.end_loc]:
+            steps_taken += 1
+            cell = next_cell
+        return cell, steps_taken
+
+    def dfs_longest(
+            self,
+            neighbors: list[list[tuple[int, int]]],
+            cur_index: int,
+            cur_dist: int,
+            visited: int,
+    ) -> int | None:
+        # `neighbors` lists (junction index, distance) pairs; `visited` is a bitmask of junction indices
+        if cur_index == self.end_index:
             return cur_dist
         longest = None
-        for next_index, dist in enumerate(adjacency[cur_index]):
-            if dist == 0 or next_index in visited:  # not actually connected, or backtracking
+        for next_index, dist in neighbors[cur_index]:
+            if visited >> next_index & 1:  # backtracking
                 continue
-            result = self.dfs_longest(adjacency, next_index, cur_dist + dist, visited | {next_index})
+            result = self.dfs_longest(neighbors, next_index, cur_dist + dist, visited | 1 << next_index)
             if result is None:
                 continue
             if longest is None or result > longest:
@@ -135,31 +125,34 @@ class Solver:
         return longest
 
     def solve(self) -> int:
+        cells, steps = self.grid.cells, self.grid.steps
+        start_cell = self.grid.index(self.start_loc)
+        end_cell = self.grid.index(self.end_loc)
         # make a graph / adjacency matrix between junctions
         adjacency = np.zeros((self.n, self.n), dtype=int)
         # first leg manually
-        discovery = self._trailblaze(Direction.DOWN.shift(self.start_loc), {self.start_loc})
+        discovery = self._trailblaze(start_cell + steps[DOWN], {start_cell})
         assert discovery is not None
         first_junction, n_steps = discovery
-        adjacency[self.junction_to_index[self.start_loc], self.junction_to_index[first_junction]] = n_steps
-        searched = {self.start_loc}
+        adjacency[self.junction_to_index[start_cell], self.junction_to_index[first_junction]] = n_steps
+        searched = {start_cell}
         # search through the rest of the map
         to_search = {first_junction}
         while len(to_search) > 0:
             search_start_junction = to_search.pop()
             searched.add(search_start_junction)
-            if search_start_junction == self.end_loc:
+            if search_start_junction == end_cell:
                 continue
             search_start_junction_index = self.junction_to_index[search_start_junction]
-            for direction in Direction:
-                next_loc = direction.shift(search_start_junction)
-                sym = self.grid[next_loc]
+            for direction in DIRECTIONS:
+                next_cell = search_start_junction + steps[direction]
+                sym = cells[next_cell]
                 if sym == TREE:
                     continue
-                if ICE_TO_DIRECTION.get(sym) == direction.opposite():
+                if ICE_DIRECTIONS[sym] == OPPOSITE[direction]:
                     continue  # can't go onto ice that would push us right back
                 # can indeed step here
-                discovery = self._trailblaze(next_loc, {search_start_junction})
+                discovery = self._trailblaze(next_cell, {search_start_junction})
                 if discovery is None:
                     continue
                 next_junction, n_steps = discovery
@@ -167,8 +160,12 @@ class Solver:
                 if next_junction not in searched:
                     to_search.add(next_junction)
         # do a DFS to find the longest path from start to finish
-        start_loc_index = self.junction_to_index[self.start_loc]
-        return self.dfs_longest(adjacency, start_loc_index, 0, {start_loc_index})
+        neighbors = [
+            [(next_index, dist) for next_index, dist in enumerate(row) if dist != 0]  # 0 means not connected
+            for row in adjacency.tolist()
+        ]
+        start_loc_index = self.junction_to_index[start_cell]
+        return self.dfs_longest(neighbors, start_loc_index, 0, 1 << start_loc_index)
 
 
 def main():
@@ -1,9 +1,13 @@
 from pathlib import Path
-import z3
 from pprint import pprint
 
 import numpy as np
-from tqdm import tqdm
+
+from advent.lazy import lazy_import
+
+# heavy, and only needed by one part each
+z3 = lazy_import("z3")
+tqdm = lazy_import("tqdm")
 
 Triple = tuple[int, int, int]
 Input = list[tuple[Triple, Triple]]
@@ -58,7 +62,7 @@ def solve1(input_: Input) -> int:
     ]
     count = 0
     # with mp.Pool(8) as pool:
-    for i, hail_i in enumerate(tqdm(input_np)):
+    for i, hail_i in enumerate(tqdm.tqdm(input_np)):
         j_start = i + 1
         for j, hail_j in enumerate(input_np[j_start:], start=j_start):
             intersection = get_intersection(hail_i, hail_j)
@@ -1,26 +1,42 @@
 from pathlib import Path
-from pprint import pprint
 from typing import Any
 
+from advent.puzzle import Puzzle
+
 Input = str  # feel free to change per-problem; whatever structure is easiest
 
 INPUT_FILE_PATH = Path("input.txt")
 
+puzzle = Puzzle(__name__)
+
 
+@puzzle.parser
 def read_input() -> Input:
     with open(INPUT_FILE_PATH, "r", encoding="utf-8") as f:
         return f.read()
 
 
-def solve(input_: Input) -> Any:
+@puzzle.part
+def solve1(input_: Input) -> Any:
+    with puzzle.span("solve1"):  # spans time any stretch of a part; `python dayNN.py --time` prints them
+        return input_  # TODO
+
+
+@puzzle.part
+def solve2(input_: Input) -> Any:
     return input_  # TODO
 
 
-def main():
-    input_ = read_input()
-    answer = solve(input_)
-    pprint(answer)
+# optional: parse records one at a time and solve every part in a single pass, for `--stream`
+# @puzzle.stream_parser
+# def iter_input() -> Iterator[Record]: ...
+# @puzzle.stream_solver
+# def solve_stream(records: Iterable[Record]) -> tuple[Any, ...]: ...
+
+# optional: synthetic inputs of a given size, for `python -m advent generate`
+# @puzzle.generator
+# def generate(size: int, rng: np.random.Generator) -> Iterator[str]: ...
 
 
 if __name__ == "__main__":
-    main()
+    puzzle.main()
@@ -0,0 +1,18 @@
+import numpy as np
+
+import day02
+
+
+def test_both_ways_of_answering_many_bags_agree(monkeypatch):
+    text = "Game 1: 3 blue, 4 red; 2 green\nGame 2: 1 blue\nGame 3: 20 red, 5 green; 7 blue\n"
+    input_ = day02.parse_games(np.frombuffer(text.encode(), dtype=np.uint8))
+    bags = [
+        {"red": 12, "green": 13, "blue": 14},
+        {"red": -1, "green": 13, "blue": 14},  # not even a game without red pulls fits
+        {"red": 0, "green": 0, "blue": 1},
+        {"red": 100, "green": 100, "blue": 100},
+    ]
+    expected = [3, 0, 2, 6]
+    assert day02.solve1_many(input_, bags) == expected
+    monkeypatch.setattr(day02, "MAX_TABLE_SIZE", 0)
+    assert day02.solve1_many(input_, bags) == expected
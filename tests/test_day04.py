@@ -0,0 +1,41 @@
+import numpy as np
+
+import day04
+
+
+def parse(text: str) -> list[int]:
+    return day04.parse_cards(np.frombuffer(text.encode(), dtype=np.uint8)).tolist()
+
+
+def test_duplicated_held_numbers_count_once():
+    text = "Card 1: 41 48 | 48 48 48 17\nCard 2: 1 2 3 | 3 3 2 9\n"
+    assert parse(text) == [1, 2]
+
+
+def test_big_numbers_match_without_bitmasks():
+    text = "Card 1: 10000000 5 | 10000000 10000000 5 6\nCard 2: 7 | 8\nCard 3: 99999999 | 10000000\n"
+    assert parse(text) == [2, 0, 0]
+
+
+def test_both_ways_of_matching_agree():
+    rng = np.random.default_rng(0)
+    cards = [(rng.integers(1, 100, size=5).tolist(), rng.integers(1, 100, size=8).tolist()) for _ in range(200)]
+
+    def to_text(offset: int) -> str:
+        return "".join(
+            f"Card {i + 1}: {' '.join(str(n + offset) for n in winning)} | {' '.join(str(n + offset) for n in held)}\n"
+            for i, (winning, held) in enumerate(cards)
+        )
+
+    expected = [day04.count_matches((winning, list(set(held)))) for winning, held in cards]
+    assert parse(to_text(0)) == expected
+    # every number past the bitmask limit, without changing which of them match
+    assert parse(to_text(10**7)) == expected
+
+
+def test_stream_agrees_with_parsed_cards(tmp_path, monkeypatch):
+    path = tmp_path / "input.txt"
+    path.write_text("Card 1: 41 48 | 48 48 17\nCard 2: 5 6 | 6 5 6\nCard 3: 1 | 2\n")
+    monkeypatch.setattr(day04, "INPUT_FILE_PATH", path)
+    input_ = day04.read_input()
+    assert day04.solve_stream(day04.iter_input()) == (day04.solve1(input_), day04.solve2(input_)) == (3, 6)
@@ -0,0 +1,53 @@
+import gc
+import weakref
+
+from advent.memo import entry_size, memoize
+
+
+def test_entry_size_counts_what_the_key_holds():
+    long_string = "#" * 5000
+    assert entry_size((long_string,), 0) > 5000
+    assert entry_size(((long_string, ()), 1), 0) > 5000  # arguments that are tuples themselves
+
+
+def test_max_bytes_bounds_long_string_keys():
+    max_bytes = 1 << 20
+
+    @memoize(max_bytes=max_bytes)
+    def count_broken(spring_states: str) -> int:
+        return spring_states.count("#")
+
+    for i in range(1000):
+        count_broken(f"{i}" + "#" * 5000)
+    assert count_broken.memo.n_bytes <= max_bytes
+    assert len(count_broken.memo) < 1000
+    assert count_broken.stats.evictions > 0
+
+
+def test_keyword_arguments_get_keys_of_their_own():
+    @memoize
+    def describe(*args, **kwargs) -> str:
+        return f"{args} {kwargs}"
+
+    assert describe((1,), (("a", 2),)) != describe(1, a=2)
+    assert describe.stats.misses == 2
+
+
+def test_per_instance_caches_are_separate_and_freed_with_the_instance():
+    class Springs:
+        def __init__(self, offset: int):
+            self.offset = offset
+
+        @memoize(per_instance=True)
+        def arrangements(self, n: int) -> int:
+            return self.offset + n
+
+    first = Springs(0)
+    second = Springs(100)
+    assert (first.arrangements(1), second.arrangements(1), first.arrangements(1)) == (1, 101, 1)
+    assert len(Springs.arrangements.memo_of(first)) == len(Springs.arrangements.memo_of(second)) == 1
+    assert Springs.arrangements.stats.hits == 1
+    memo = weakref.ref(Springs.arrangements.memo_of(first))
+    del first
+    gc.collect()
+    assert memo() is None
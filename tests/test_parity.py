@@ -0,0 +1,12 @@
+from advent.parity import ParityResult, answers_agree
+
+
+def result(language: str, answers: list[str], error: str | None = None) -> ParityResult:
+    return ParityResult(day="day01", language=language, n_lines=1, answers=answers, error=error)
+
+
+def test_answers_agree_needs_two_languages_answering():
+    python = result("python", ["351", "340"])
+    assert not answers_agree([python, result("kotlin", [], error="kotlin not found")])
+    assert answers_agree([python, result("typescript", ["351", "340"])])
+    assert not answers_agree([python, result("typescript", ["351", "341"])])